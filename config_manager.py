@@ -1,12 +1,22 @@
 import json
 import os
+import atexit
+import hashlib
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 
+from file_watcher import FILE_HASH_VERSION
 
-@dataclass
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@dataclass(slots=True)
 class AppConfig:
     repo_full_name: str = ""
     repo_url: str = ""
@@ -23,7 +33,9 @@ class AppConfig:
         "mihomo.yaml"
     ])
     last_upload_time: str = ""
-    file_hashes: Dict[str, str] = field(default_factory=dict)
+    # 文件名 -> {"hash": 哈希, "mtime_ns": 修改时间, "size": 大小}
+    file_hashes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    file_hash_version: int = 0
     git_username: str = ""
     git_email: str = ""
     # 窗口位置和大小
@@ -37,66 +49,166 @@ class AppConfig:
     success_upload_count: int = 0
     failed_upload_count: int = 0
     first_upload_time: str = ""
+    
+    def to_dict(self) -> Dict[str, Any]:
+        # 浅拷贝：列表/字典字段直接引用，写入在锁内完成且不会修改它们
+        return {f.name: getattr(self, f.name) for f in _FIELDS}
+
+
+_FIELDS = tuple(fields(AppConfig))
 
 
 class ConfigManager:
     CONFIG_FILE = "app_config.json"
+    # 合并写入的延迟（秒），突发的多次修改只落盘一次
+    SAVE_DELAY = 1.0
     
     def __init__(self):
         self.config_path = Path(self.CONFIG_FILE)
         self._config = AppConfig()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        # 最近一次写入磁盘的内容摘要，内容未变化时跳过写入
+        self._saved_digest: Optional[bytes] = None
+        self._target_path_cache: Optional[Path] = None
         self.load()
+        atexit.register(self.flush)
     
     def load(self) -> AppConfig:
+        self._target_path_cache = None
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self._config = AppConfig(**data)
+                if orjson is not None:
+                    data = orjson.loads(self.config_path.read_bytes())
+                else:
+                    with open(self.config_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                self._config = AppConfig(**data)
             except Exception:
                 self._config = AppConfig()
+        
+        # 旧格式（只保存哈希字符串）的版本号均小于当前版本，在这里一并丢弃，之后重新计算
+        if self._config.file_hash_version != FILE_HASH_VERSION:
+            had_hashes = bool(self._config.file_hashes)
+            self._config.file_hashes = {}
+            self._config.file_hash_version = FILE_HASH_VERSION
+            if had_hashes:
+                self.save()
         return self._config
     
-    def save(self) -> bool:
+    def save(self):
+        """标记配置已修改，延迟合并写入磁盘；需要确认写入结果时调用 flush"""
+        with self._lock:
+            self._dirty = True
+            self._schedule_flush()
+    
+    def flush(self) -> bool:
+        """立即写入尚未落盘的修改（退出前调用）"""
+        with self._lock:
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return True
+            return self._save_now()
+    
+    def _schedule_flush(self):
+        # 已有待执行的写入时直接并入，不必为每次修改重建定时器线程
+        if self._flush_timer:
+            return
+        self._flush_timer = threading.Timer(self.SAVE_DELAY, self._on_flush_timer)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+    
+    def _on_flush_timer(self):
+        with self._lock:
+            self._flush_timer = None
+            if self._dirty:
+                self._save_now()
+    
+    def _save_now(self) -> bool:
+        # 调用方需持有 self._lock；先写临时文件再原子替换，避免写入中断导致配置损坏
+        # 配置文件不需要手工编辑，输出紧凑 JSON
+        tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(asdict(self._config), f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                data = orjson.dumps(self._config.to_dict())
+            else:
+                data = json.dumps(
+                    self._config.to_dict(), ensure_ascii=False, separators=(',', ':')
+                ).encode('utf-8')
+            
+            # 与上次写入的内容相同（例如只是重新保存了相同的设置），不必写盘
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if digest == self._saved_digest and self.config_path.exists():
+                self._dirty = False
+                return True
+            
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.config_path)
+            self._saved_digest = digest
+            self._dirty = False
             return True
-        except Exception:
+        except Exception as e:
+            # 保持 _dirty，下次保存或退出时重试
+            print(f"保存配置失败: {e}")
             return False
     
     @property
     def config(self) -> AppConfig:
         return self._config
     
-    def update(self, **kwargs) -> bool:
-        for key, value in kwargs.items():
-            if hasattr(self._config, key):
-                setattr(self._config, key, value)
-        return self.save()
+    def update(self, **kwargs):
+        with self._lock:
+            for key, value in kwargs.items():
+                if hasattr(self._config, key):
+                    setattr(self._config, key, value)
+            if "target_folder" in kwargs:
+                self._target_path_cache = None
+        self.save()
     
     def get_file_hash(self, filename: str) -> str:
-        return self._config.file_hashes.get(filename, "")
+        entry = self._config.file_hashes.get(filename)
+        return entry.get("hash", "") if entry else ""
     
-    def set_file_hash(self, filename: str, file_hash: str) -> bool:
-        self._config.file_hashes[filename] = file_hash
-        return self.save()
+    def set_file_hash(self, filename: str, file_hash: Dict[str, Any]):
+        # 在锁内修改，避免后台写入线程序列化时字典被并发修改
+        with self._lock:
+            self._config.file_hashes[filename] = file_hash
+        self.save()
     
-    def update_last_upload_time(self) -> bool:
-        self._config.last_upload_time = datetime.now().strftime("%Y年%m月%d日 %H:%M:%S")
-        return self.save()
+    def set_file_hashes(self, file_hashes: Dict[str, Dict[str, Any]]):
+        """批量更新文件哈希，只触发一次保存"""
+        with self._lock:
+            self._config.file_hashes.update(file_hashes)
+        self.save()
+    
+    def update_last_upload_time(self):
+        last_upload_time = datetime.now().strftime("%Y年%m月%d日 %H:%M:%S")
+        with self._lock:
+            self._config.last_upload_time = last_upload_time
+        self.save()
     
     def get_target_files(self) -> List[Path]:
         if not self._config.target_folder:
             return []
         
-        target_path = Path(self._config.target_folder)
-        if not target_path.exists():
+        if self._target_path_cache is None:
+            self._target_path_cache = Path(self._config.target_folder)
+        
+        # 一次目录扫描代替逐个文件 exists()，is_file 对普通文件直接使用目录项类型信息
+        wanted = frozenset(self._config.files_to_upload)
+        try:
+            with os.scandir(self._target_path_cache) as it:
+                found = {
+                    entry.name: Path(entry.path)
+                    for entry in it
+                    if entry.name in wanted and entry.is_file()
+                }
+        except OSError:
             return []
         
-        files = []
-        for filename in self._config.files_to_upload:
-            file_path = target_path / filename
-            if file_path.exists():
-                files.append(file_path)
-        return files
+        # 保持与 files_to_upload 相同的顺序
+        return [found[name] for name in self._config.files_to_upload if name in found]
@@ -2,8 +2,11 @@
 GitHub Uploader - 凭证管理器
 使用keyring安全存储GitHub访问令牌
 """
+import time
+import threading
 import keyring
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 from dataclasses import dataclass
 
 
@@ -33,11 +36,18 @@ class CredentialManager:
     USER_ID_KEY = "github_user_id"
     AVATAR_KEY = "github_avatar_url"
     SCOPE_KEY = "github_scope"
+    # 全部键名（顺序与 load_credential 中的解包一致）
+    ALL_KEYS = (TOKEN_KEY, USERNAME_KEY, USER_ID_KEY, AVATAR_KEY, SCOPE_KEY)
+    # 缓存有效期（秒），过期后重新从keyring读取
+    CACHE_TTL = 300.0
 
     def __init__(self):
         print("凭证管理器初始化")
-        self._cached_credential: Optional[GitHubCredential] = None
-        self._cache_valid = False
+        # (凭证, 过期时间) 作为单个引用整体替换，读取方无需加锁即可看到一致的值；
+        # 凭证为 None 表示已确认未登录，同样缓存
+        self._cache: Optional[Tuple[Optional[GitHubCredential], float]] = None
+        # 缓存过期时只允许一个线程读取keyring
+        self._load_lock = threading.Lock()
     
     def save_credential(self, credential: GitHubCredential) -> bool:
         """
@@ -50,48 +60,43 @@ class CredentialManager:
             是否保存成功
         """
         try:
-            # 存储访问令牌（主要凭证）
-            keyring.set_password(
-                self.SERVICE_NAME,
-                self.TOKEN_KEY,
-                credential.access_token
-            )
+            existing = self.load_credential()
+            if existing is credential:
+                # 调用方直接修改了缓存中的对象，无法比较差异，全部写入
+                existing = None
 
-            # 存储用户名
+            # 需要写入的字段：访问令牌（主要凭证）、用户名、用户ID、头像URL、scope
+            fields = [(self.TOKEN_KEY, credential.access_token)]
             if credential.username:
-                keyring.set_password(
-                    self.SERVICE_NAME,
-                    self.USERNAME_KEY,
-                    credential.username
-                )
-
-            # 存储用户ID
+                fields.append((self.USERNAME_KEY, credential.username))
             if credential.user_id is not None:
-                keyring.set_password(
-                    self.SERVICE_NAME,
-                    self.USER_ID_KEY,
-                    str(credential.user_id)
-                )
-
-            # 存储头像URL
+                fields.append((self.USER_ID_KEY, str(credential.user_id)))
             if credential.avatar_url:
-                keyring.set_password(
-                    self.SERVICE_NAME,
-                    self.AVATAR_KEY,
-                    credential.avatar_url
-                )
-
-            # 存储scope
+                fields.append((self.AVATAR_KEY, credential.avatar_url))
             if credential.scope:
-                keyring.set_password(
-                    self.SERVICE_NAME,
-                    self.SCOPE_KEY,
-                    credential.scope
-                )
-
-            # 更新缓存
-            self._cached_credential = credential
-            self._cache_valid = True
+                fields.append((self.SCOPE_KEY, credential.scope))
+
+            # 跳过与已保存值相同的字段
+            if existing:
+                stored = {
+                    self.TOKEN_KEY: existing.access_token,
+                    self.USERNAME_KEY: existing.username,
+                    self.USER_ID_KEY: str(existing.user_id) if existing.user_id is not None else None,
+                    self.AVATAR_KEY: existing.avatar_url,
+                    self.SCOPE_KEY: existing.scope,
+                }
+                fields = [(key, value) for key, value in fields if stored.get(key) != value]
+
+            if fields:
+                with ThreadPoolExecutor(max_workers=len(fields)) as executor:
+                    # list() 用于等待全部完成并抛出其中的异常
+                    list(executor.map(
+                        lambda item: keyring.set_password(self.SERVICE_NAME, *item),
+                        fields,
+                    ))
+
+            # 更新缓存（写入即刷新，缓存内容与keyring一致）
+            self._cache = (credential, time.monotonic() + self.CACHE_TTL)
 
             print(f"凭证已安全存储: {credential.username or 'unknown'}")
             return True
@@ -110,24 +115,35 @@ class CredentialManager:
         Returns:
             GitHubCredential对象，如果不存在则返回None
         """
-        # 如果缓存有效，直接返回缓存的凭证
-        if use_cache and self._cache_valid and self._cached_credential:
-            return self._cached_credential
-
+        # 如果缓存有效且未过期，直接返回缓存的凭证
+        cache = self._cache
+        if use_cache and cache and cache[1] > time.monotonic():
+            return cache[0]
+
+        with self._load_lock:
+            # 等待锁期间其他线程可能已刷新缓存
+            cache = self._cache
+            if use_cache and cache and cache[1] > time.monotonic():
+                return cache[0]
+            return self._load_from_keyring(use_cache)
+
+    def _load_from_keyring(self, use_cache: bool) -> Optional[GitHubCredential]:
+        """从keyring读取凭证并刷新缓存，调用方需持有 self._load_lock"""
         try:
-            # 获取访问令牌
-            access_token = keyring.get_password(self.SERVICE_NAME, self.TOKEN_KEY)
+            # 并发读取所有字段，总耗时约等于单次keyring往返
+            with ThreadPoolExecutor(max_workers=len(self.ALL_KEYS)) as executor:
+                access_token, username, user_id_str, avatar_url, scope = executor.map(
+                    lambda key: keyring.get_password(self.SERVICE_NAME, key),
+                    self.ALL_KEYS,
+                )
 
             if not access_token:
-                if not self._cache_valid:
+                if self._cache is None:
                     print("未找到已保存的凭证")
+                self._cache = (None, time.monotonic() + self.CACHE_TTL)
                 return None
 
-            # 获取其他信息
-            username = keyring.get_password(self.SERVICE_NAME, self.USERNAME_KEY)
-            user_id_str = keyring.get_password(self.SERVICE_NAME, self.USER_ID_KEY)
-            avatar_url = keyring.get_password(self.SERVICE_NAME, self.AVATAR_KEY)
-            scope = keyring.get_password(self.SERVICE_NAME, self.SCOPE_KEY) or ""
+            scope = scope or ""
 
             user_id = int(user_id_str) if user_id_str else None
 
@@ -140,8 +156,7 @@ class CredentialManager:
             )
 
             # 缓存凭证
-            self._cached_credential = credential
-            self._cache_valid = True
+            self._cache = (credential, time.monotonic() + self.CACHE_TTL)
 
             # 只在第一次加载时打印日志
             if not use_cache:
@@ -161,24 +176,19 @@ class CredentialManager:
             是否删除成功
         """
         try:
-            keys = [
-                self.TOKEN_KEY,
-                self.USERNAME_KEY,
-                self.USER_ID_KEY,
-                self.AVATAR_KEY,
-                self.SCOPE_KEY,
-            ]
-
-            for key in keys:
+            def delete_key(key: str):
                 try:
                     keyring.delete_password(self.SERVICE_NAME, key)
                 except keyring.errors.PasswordDeleteError:
                     # 密码不存在，忽略
                     pass
 
-            # 清除缓存
-            self._cached_credential = None
-            self._cache_valid = False
+            with ThreadPoolExecutor(max_workers=len(self.ALL_KEYS)) as executor:
+                # list() 用于等待全部完成并抛出其中的异常
+                list(executor.map(delete_key, self.ALL_KEYS))
+
+            # 缓存"未登录"状态，避免之后的检查再次读取keyring
+            self._cache = (None, time.monotonic() + self.CACHE_TTL)
 
             print("凭证已删除")
             return True
@@ -194,11 +204,7 @@ class CredentialManager:
         Returns:
             是否存在凭证
         """
-        try:
-            token = keyring.get_password(self.SERVICE_NAME, self.TOKEN_KEY)
-            return token is not None
-        except Exception:
-            return False
+        return self.load_credential() is not None
     
     def get_access_token(self) -> Optional[str]:
         """
@@ -207,11 +213,8 @@ class CredentialManager:
         Returns:
             访问令牌字符串，如果不存在则返回None
         """
-        try:
-            return keyring.get_password(self.SERVICE_NAME, self.TOKEN_KEY)
-        except Exception as e:
-            print(f"获取访问令牌失败: {e}")
-            return None
+        credential = self.load_credential()
+        return credential.access_token if credential else None
 
 
 # 全局凭证管理器实例
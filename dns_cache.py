@@ -0,0 +1,37 @@
+"""
+进程内 DNS 缓存
+替换 socket.getaddrinfo，相同的解析请求在 DNS_TTL 秒内直接返回上次结果；
+httpx 建立连接、网络测试等都经过 socket.getaddrinfo，因此同时受益
+"""
+import socket
+import time
+from typing import Dict, Tuple
+
+# 解析结果缓存时长（秒）；连接失败时调用方会提前清空缓存
+DNS_TTL = 60.0
+
+# (getaddrinfo 参数) -> (过期时间, 解析结果)
+_cache: Dict[tuple, Tuple[float, list]] = {}
+_orig_getaddrinfo = socket.getaddrinfo
+
+
+def cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """带 TTL 缓存的 socket.getaddrinfo，只缓存成功的解析结果"""
+    key = (host, port, family, type, proto, flags)
+    entry = _cache.get(key)
+    if entry and entry[0] > time.monotonic():
+        return list(entry[1])
+
+    result = _orig_getaddrinfo(host, port, family, type, proto, flags)
+    _cache[key] = (time.monotonic() + DNS_TTL, result)
+    return list(result)
+
+
+def clear():
+    """清空缓存，例如网络环境变化后"""
+    _cache.clear()
+
+
+def install():
+    """替换 socket.getaddrinfo，重复调用无副作用"""
+    socket.getaddrinfo = cached_getaddrinfo
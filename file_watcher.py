@@ -1,36 +1,98 @@
 import os
 import time
+import atexit
 import hashlib
 from pathlib import Path
-from typing import Set, List, Callable, Optional
-from threading import Thread, Event
+from typing import Set, List, Dict, Callable, Optional
+from threading import Thread, Lock, Timer
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileModifiedEvent, FileCreatedEvent
 
+try:
+    # 可选：BLAKE3 可在单个文件内多线程并行计算
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+# file_hashes 使用的哈希算法版本，变更算法时递增以丢弃旧哈希
+# 0: md5  1: blake2b  2: blake3
+FILE_HASH_VERSION = 2 if blake3 is not None else 1
+# 旧版本 Python 回退路径的读取块大小
+HASH_CHUNK_SIZE = 1 << 20
+
+# 所有 FileWatcher 共享的监控线程，按需启动，重新选择目录时只重新注册监控路径
+_observer: Optional[Observer] = None
+_observer_lock = Lock()
+
+
+def _get_observer() -> Observer:
+    global _observer
+    with _observer_lock:
+        if _observer is None:
+            _observer = Observer()
+            _observer.daemon = True
+            _observer.start()
+            atexit.register(_stop_observer)
+        return _observer
+
+
+def _stop_observer():
+    if _observer is not None:
+        _observer.stop()
+        _observer.join()
+
 
 class FileChangeHandler(FileSystemEventHandler):
+    # 同一文件在该时间窗口（秒）内的多次事件只回调一次
+    DEBOUNCE_SECONDS = 0.25
+    
     def __init__(self, target_files: Set[str], callback: Callable[[str], None]):
         super().__init__()
         self.target_files = target_files
         self.callback = callback
+        self._pending: Dict[str, Timer] = {}
+        self._pending_lock = Lock()
     
     def on_modified(self, event):
-        if not event.is_directory:
-            filename = Path(event.src_path).name
-            if filename in self.target_files:
-                self.callback(filename)
+        self._on_event(event)
     
     def on_created(self, event):
-        if not event.is_directory:
-            filename = Path(event.src_path).name
-            if filename in self.target_files:
-                self.callback(filename)
+        self._on_event(event)
+    
+    def _on_event(self, event):
+        if event.is_directory:
+            return
+        filename = Path(event.src_path).name
+        if filename in self.target_files:
+            self._schedule(filename)
+    
+    def _schedule(self, filename: str):
+        # 编辑器保存时常产生多次事件，合并为最后一次事件后的单次回调
+        with self._pending_lock:
+            timer = self._pending.get(filename)
+            if timer:
+                timer.cancel()
+            timer = Timer(self.DEBOUNCE_SECONDS, self._fire, args=(filename,))
+            timer.daemon = True
+            self._pending[filename] = timer
+            timer.start()
+    
+    def _fire(self, filename: str):
+        with self._pending_lock:
+            self._pending.pop(filename, None)
+        self.callback(filename)
+    
+    def cancel_pending(self):
+        with self._pending_lock:
+            for timer in self._pending.values():
+                timer.cancel()
+            self._pending.clear()
 
 
 class FileWatcher:
     def __init__(self):
-        self.observer: Optional[Observer] = None
         self.event_handler: Optional[FileChangeHandler] = None
+        self._watch = None
         self._watch_path: Optional[Path] = None
         self._target_files: Set[str] = set()
         self._change_callback: Optional[Callable[[str], None]] = None
@@ -50,19 +112,23 @@ class FileWatcher:
         
         try:
             self.event_handler = FileChangeHandler(self._target_files, self._on_file_changed)
-            self.observer = Observer()
-            self.observer.schedule(self.event_handler, str(watch_path), recursive=False)
-            self.observer.start()
+            self._watch = _get_observer().schedule(self.event_handler, str(watch_path), recursive=False)
             self._running = True
             return True
         except Exception:
             return False
     
     def stop(self):
-        if self.observer:
-            self.observer.stop()
-            self.observer.join()
-            self.observer = None
+        if self._watch is not None:
+            try:
+                _get_observer().unschedule(self._watch)
+            except KeyError:
+                # 监控已被移除
+                pass
+            self._watch = None
+        if self.event_handler:
+            self.event_handler.cancel_pending()
+            self.event_handler = None
         self._running = False
     
     def _on_file_changed(self, filename: str):
@@ -75,50 +141,60 @@ class FileWatcher:
 
 class FileHashCache:
     def __init__(self):
+        # str(path) -> ((st_mtime_ns, st_size), hash)
         self._hashes: dict = {}
-        self._lock = Event()
-        self._lock.set()
+        self._lock = Lock()
     
     def get_hash(self, filepath: Path) -> str:
-        if not filepath.exists():
+        try:
+            st = filepath.stat()
+        except FileNotFoundError:
             return ""
         
-        self._lock.wait()
-        cached = self._hashes.get(str(filepath))
+        cache_key = (st.st_mtime_ns, st.st_size)
+        path_key = str(filepath)
         
-        current_mtime = filepath.stat().st_mtime
-        current_size = filepath.stat().st_size
-        cache_key = f"{current_mtime}_{current_size}"
-        
-        if cached and cached.get("key") == cache_key:
-            return cached.get("hash", "")
+        with self._lock:
+            cached = self._hashes.get(path_key)
+        if cached and cached[0] == cache_key:
+            return cached[1]
         
         file_hash = self._calculate_hash(filepath)
-        self._hashes[str(filepath)] = {
-            "key": cache_key,
-            "hash": file_hash
-        }
+        if file_hash:
+            with self._lock:
+                self._hashes[path_key] = (cache_key, file_hash)
         return file_hash
     
     def _calculate_hash(self, filepath: Path) -> str:
-        hash_md5 = hashlib.md5()
         try:
+            if blake3 is not None:
+                # 内存映射读取，大文件自动多线程计算
+                hasher = blake3(max_threads=blake3.AUTO)
+                hasher.update_mmap(str(filepath))
+                return hasher.hexdigest()
             with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(8192), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+                if hasattr(hashlib, "file_digest"):
+                    # Python 3.11+: 读取与计算都在 C 层完成并释放 GIL
+                    return hashlib.file_digest(f, "blake2b").hexdigest()
+                hasher = hashlib.blake2b()
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+                return hasher.hexdigest()
         except Exception:
             return ""
     
     def clear(self):
-        self._hashes.clear()
+        with self._lock:
+            self._hashes.clear()
     
     def update_hash(self, filepath: Path, file_hash: str):
-        if filepath.exists():
-            current_mtime = filepath.stat().st_mtime
-            current_size = filepath.stat().st_size
-            cache_key = f"{current_mtime}_{current_size}"
-            self._hashes[str(filepath)] = {
-                "key": cache_key,
-                "hash": file_hash
-            }
+        try:
+            st = filepath.stat()
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._hashes[str(filepath)] = ((st.st_mtime_ns, st.st_size), file_hash)
+
+
+# 全局文件哈希缓存实例
+file_hash_cache = FileHashCache()
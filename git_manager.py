@@ -1,11 +1,71 @@
-import os
+import sys
 import shutil
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
 from datetime import datetime
 from typing import List, Optional, Tuple, Callable
 from git import Repo, GitCommandError
-from git.exc import InvalidGitRepositoryError
+from git.objects import Commit
+from git.exc import InvalidGitRepositoryError, NoSuchPathError
+
+from file_watcher import file_hash_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    # 可选：通过 libgit2 在进程内完成克隆/拉取/推送，未安装时使用 git 命令
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# Linux FICLONE ioctl：在 btrfs/xfs 等文件系统上以写时复制方式克隆文件
+FICLONE = 0x40049409
+# 并行复制文件的最大线程数
+MAX_COPY_WORKERS = 8
+# libgit2 默认不使用代理；True 表示与 git 命令一样读取 git 配置（http.proxy）和代理环境变量
+LIBGIT2_PROXY = True
+# 没有文件变更、跳过上传时 sync_and_upload 返回的消息
+NO_CHANGES_MESSAGE = "无变更，跳过"
+
+
+if pygit2 is not None:
+    class _RemoteCallbacks(pygit2.RemoteCallbacks):
+        """libgit2 远程操作回调，将被拒绝的推送转为异常"""
+
+        def push_update_reference(self, refname, message):
+            if message:
+                raise pygit2.GitError(f"推送被拒绝 {refname}: {message}")
+
+
+def _normalize_remote_url(url: str) -> str:
+    """去掉 URL 中的认证信息和 .git 后缀，用于判断是否为同一远程仓库"""
+    parts = urlsplit(url)
+    if parts.scheme in ("http", "https"):
+        netloc = parts.netloc.rsplit("@", 1)[-1].lower()
+        url = urlunsplit((parts.scheme, netloc, parts.path, "", ""))
+    url = url.rstrip("/")
+    return url[:-4] if url.endswith(".git") else url
+
+
+def _fast_copy(src: Path, dst: Path):
+    """复制文件内容并保留权限位和访问/修改时间（同 shutil.copy2），优先使用写时复制克隆"""
+    cloned = False
+    if fcntl is not None and sys.platform.startswith("linux"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            cloned = True
+        except OSError:
+            # 文件系统不支持或跨设备，回退到普通复制
+            pass
+    if not cloned:
+        # copyfile 在 Linux 上内部使用 sendfile，在 macOS 上使用 fcopyfile
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
 
 
 class GitManager:
@@ -15,6 +75,8 @@ class GitManager:
         self.branch = branch
         self.repo: Optional[Repo] = None
         self._progress_callback: Optional[Callable[[str], None]] = None
+        self._username = ""
+        self._token = ""
     
     def set_progress_callback(self, callback: Callable[[str], None]):
         self._progress_callback = callback
@@ -24,30 +86,31 @@ class GitManager:
             self._progress_callback(message)
     
     def is_initialized(self) -> bool:
-        try:
-            Repo(self.local_path)
-            return True
-        except InvalidGitRepositoryError:
-            return False
+        return self.load_repository()
     
     def init_repository(self, username: str = "", email: str = "", token: str = "") -> Tuple[bool, str]:
         try:
             self._notify("开始初始化仓库...")
             
-            if self.local_path.exists():
-                shutil.rmtree(self.local_path)
-            
-            self.local_path.mkdir(parents=True, exist_ok=True)
-            
             auth_url = self._build_auth_url(username, token)
+            self._username, self._token = username, token
             
-            self._notify("克隆远程仓库...")
-            self.repo = Repo.clone_from(auth_url, self.local_path, branch=self.branch)
+            # 已有同一远程的本地仓库时直接同步，避免删除后重新克隆
+            if not self._reset_existing_repository(auth_url):
+                if self.local_path.exists():
+                    shutil.rmtree(self.local_path)
+                
+                self.local_path.mkdir(parents=True, exist_ok=True)
+                
+                self._notify("克隆远程仓库...")
+                self.repo = self._clone(auth_url)
             
-            if username and email:
-                with self.repo.config_writer() as config:
+            with self.repo.config_writer() as config:
+                if username and email:
                     config.set_value("user", "name", username)
                     config.set_value("user", "email", email)
+                # git 命令推送/拉取时使用 HTTP/2，多个请求复用同一连接
+                config.set_value("http", "version", "HTTP/2")
             
             self._notify("仓库初始化成功")
             return True, "仓库初始化成功"
@@ -61,6 +124,33 @@ class GitManager:
             self._notify(error_msg)
             return False, error_msg
     
+    def _reset_existing_repository(self, auth_url: str) -> bool:
+        """将已有的本地仓库重置为远程分支的最新状态
+
+        Returns:
+            本地路径不是同一远程的仓库时返回 False，由调用方重新克隆
+        """
+        try:
+            repo = Repo(self.local_path)
+            origin = repo.remote(name="origin")
+        except (InvalidGitRepositoryError, NoSuchPathError, ValueError):
+            return False
+        
+        if _normalize_remote_url(origin.url) != _normalize_remote_url(self.repo_url):
+            return False
+        
+        self._notify("复用本地仓库，获取远程更新...")
+        if origin.url != auth_url:
+            with repo.config_writer() as config:
+                config.set_value('remote "origin"', 'url', auth_url)
+        origin.fetch()
+        # 切换到目标分支并丢弃本地修改和未跟踪文件，效果等同于重新克隆
+        repo.git.checkout("-f", "-B", self.branch, f"origin/{self.branch}")
+        repo.git.reset("--hard", f"origin/{self.branch}")
+        repo.git.clean("-fdx")
+        self.repo = repo
+        return True
+    
     def _build_auth_url(self, username: str, token: str) -> str:
         if not token:
             return self.repo_url
@@ -72,54 +162,126 @@ class GitManager:
                 return self.repo_url
         return self.repo_url
     
+    def _remote_callbacks(self):
+        credentials = pygit2.UserPass(self._username, self._token) if self._token else None
+        return _RemoteCallbacks(credentials=credentials)
+    
+    def _clone(self, auth_url: str) -> Repo:
+        if pygit2 is not None:
+            try:
+                pygit2.clone_repository(auth_url, str(self.local_path),
+                                        checkout_branch=self.branch,
+                                        callbacks=self._remote_callbacks(),
+                                        proxy=LIBGIT2_PROXY)
+                return Repo(self.local_path)
+            except pygit2.GitError as e:
+                self._notify(f"libgit2 克隆失败，改用 git 命令: {e}")
+                shutil.rmtree(self.local_path, ignore_errors=True)
+                self.local_path.mkdir(parents=True, exist_ok=True)
+        return Repo.clone_from(auth_url, self.local_path, branch=self.branch)
+    
+    def _pull(self):
+        """拉取远程分支；libgit2 只处理可快进的情况，其余交给 git pull 合并"""
+        if pygit2 is not None:
+            try:
+                repo = pygit2.Repository(str(self.local_path))
+                repo.remotes["origin"].fetch(callbacks=self._remote_callbacks(),
+                                             proxy=LIBGIT2_PROXY)
+                remote_id = repo.lookup_reference(f"refs/remotes/origin/{self.branch}").target
+                analysis, _ = repo.merge_analysis(remote_id)
+                if analysis & pygit2.GIT_MERGE_ANALYSIS_UP_TO_DATE:
+                    return
+                if analysis & pygit2.GIT_MERGE_ANALYSIS_FASTFORWARD:
+                    repo.checkout_tree(repo.get(remote_id))
+                    repo.head.set_target(remote_id)
+                    return
+            except (pygit2.GitError, KeyError) as e:
+                self._notify(f"libgit2 拉取失败，改用 git 命令: {e}")
+        self.repo.git.pull("origin", self.branch)
+    
+    def _push(self):
+        if pygit2 is not None:
+            try:
+                repo = pygit2.Repository(str(self.local_path))
+                repo.remotes["origin"].push([f"HEAD:refs/heads/{self.branch}"],
+                                            callbacks=self._remote_callbacks(),
+                                            proxy=LIBGIT2_PROXY)
+                return
+            except (pygit2.GitError, KeyError) as e:
+                self._notify(f"libgit2 推送失败，改用 git 命令: {e}")
+        origin = self.repo.remote(name="origin")
+        origin.push(refspec=f"HEAD:{self.branch}")
+    
     def load_repository(self) -> bool:
+        # 复用已打开的仓库对象，避免重复解析 .git 目录；.git 目录被删除时重新加载
+        if (self.repo is not None
+                and Path(self.repo.working_dir).resolve() == self.local_path.resolve()
+                and Path(self.repo.git_dir).is_dir()):
+            return True
         try:
             self.repo = Repo(self.local_path)
             return True
         except Exception:
             return False
     
-    def get_file_hash(self, file_path: Path) -> str:
-        if not file_path.exists():
-            return ""
-        
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
-    
     def copy_files(self, source_files: List[Path]) -> List[Tuple[str, bool]]:
-        results = []
+        if not source_files:
+            return []
         
-        for source_file in source_files:
+        def copy_one(source_file: Path) -> Tuple[str, bool]:
             try:
-                dest_file = self.local_path / source_file.name
-                shutil.copy2(source_file, dest_file)
-                results.append((source_file.name, True))
-            except Exception as e:
-                results.append((source_file.name, False))
+                _fast_copy(source_file, self.local_path / source_file.name)
+                return source_file.name, True
+            except Exception:
+                return source_file.name, False
         
-        return results
+        # 复制是 I/O 密集操作，并行执行；map 保持结果顺序与输入一致
+        workers = min(MAX_COPY_WORKERS, len(source_files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(copy_one, source_files))
     
     def has_changes(self, source_files: List[Path], stored_hashes: dict) -> Tuple[bool, List[Path], dict]:
+        """比较源文件与已保存的哈希
+
+        stored_hashes 与返回的哈希字典格式均为 {文件名: {"hash", "mtime_ns", "size"}}
+        """
         changed_files = []
         current_hashes = {}
         
         for source_file in source_files:
-            if not source_file.exists():
+            try:
+                st = source_file.stat()
+            except FileNotFoundError:
                 continue
             
-            current_hash = self.get_file_hash(source_file)
-            current_hashes[source_file.name] = current_hash
+            stored = stored_hashes.get(source_file.name) or {}
+            if stored.get("mtime_ns") == st.st_mtime_ns and stored.get("size") == st.st_size:
+                # 修改时间和大小均未变化，沿用已保存的哈希，不读取文件
+                current_hash = stored.get("hash", "")
+            else:
+                current_hash = file_hash_cache.get_hash(source_file)
+                if not current_hash:
+                    continue
+            
+            current_hashes[source_file.name] = {
+                "hash": current_hash,
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+            }
             
-            stored_hash = stored_hashes.get(source_file.name, "")
-            if current_hash != stored_hash:
+            if current_hash != stored.get("hash", ""):
                 changed_files.append(source_file)
         
         return len(changed_files) > 0, changed_files, current_hashes
     
-    def commit_and_push(self, commit_message: str = "") -> Tuple[bool, str]:
+    def commit_and_push(self, commit_message: str = "",
+                        changed_names: Optional[List[str]] = None) -> Tuple[bool, str]:
+        """提交并推送
+
+        Args:
+            commit_message: 提交信息
+            changed_names: 已知的变更文件名；为 None 时添加全部文件，为空列表时直接创建空提交
+        """
         if not self.repo:
             if not self.load_repository():
                 return False, "仓库未加载"
@@ -127,15 +289,25 @@ class GitManager:
         try:
             self._notify("检查文件变更...")
             
-            # 强制添加所有文件
-            self.repo.git.add("-A")
+            if changed_names is None:
+                # 变更未知，添加所有文件
+                self.repo.git.add("-A")
+            elif changed_names:
+                # 只添加已知变更的文件，避免遍历整个工作区；
+                # git 子进程在仓库目录中运行，不像 IndexFile.add 那样切换整个进程的工作目录
+                self.repo.git.add("--", *changed_names)
+            # 在 add 之后读取索引，得到包含上述变更的最新内容
+            index = self.repo.index
             
             # 获取当前时间
             upload_time = datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')
             self._notify(f"上传时间: {upload_time}")
             
             # 检查是否有实际变更
-            has_changes = self.repo.is_dirty(untracked_files=True) or len(self.repo.untracked_files) > 0
+            if changed_names is None:
+                has_changes = self.repo.is_dirty(untracked_files=True) or len(self.repo.untracked_files) > 0
+            else:
+                has_changes = bool(changed_names)
             
             if not has_changes:
                 self._notify("检测到没有文件变更，创建强制上传提交...")
@@ -146,12 +318,15 @@ class GitManager:
             
             # 创建提交（允许空提交）
             self._notify(f"提交变更: {commit_message}")
-            # 使用 git commit 命令而不是 index.commit，因为 --allow-empty 不被 API 支持
-            self.repo.git.commit('--allow-empty', '-m', commit_message)
+            # 在进程内由索引生成树并创建提交，不再启动 git 子进程；
+            # 树与父提交相同时同样会创建提交，等价于 --allow-empty
+            tree = index.write_tree()
+            parents = [self.repo.head.commit] if self.repo.head.is_valid() else []
+            Commit.create_from_tree(self.repo, tree, commit_message,
+                                    parent_commits=parents, head=True)
             
             self._notify("推送到远程仓库...")
-            origin = self.repo.remote(name="origin")
-            origin.push(refspec=f"HEAD:{self.branch}")
+            self._push()
             
             self._notify("推送成功")
             return True, f"上传成功 - {upload_time}"
@@ -166,16 +341,21 @@ class GitManager:
             return False, error_msg
     
     def sync_and_upload(self, source_files: List[Path], stored_hashes: dict, 
-                        username: str = "", token: str = "") -> Tuple[bool, str, dict]:
+                        username: str = "", token: str = "",
+                        force: bool = False) -> Tuple[bool, str, dict]:
         try:
-            # 确保仓库已加载
-            if not self.repo:
-                if not self.load_repository():
-                    return False, "无法加载仓库，请先初始化仓库", stored_hashes
+            # 确保仓库已加载；仓库缺失时即使没有变更也要报告错误
+            if not self.load_repository():
+                return False, "无法加载仓库，请先初始化仓库", stored_hashes
             
+            # 检查变更（元数据未变时只需 stat），没有变更且未要求强制上传时，
+            # 直接跳过拉取、提交和推送
             has_changes, changed_files, current_hashes = self.has_changes(source_files, stored_hashes)
+            if not has_changes and not force:
+                self._notify("检测到没有文件变更，跳过上传")
+                # 返回新的元数据：内容相同但修改时间变化的文件，下次不必重新计算哈希
+                return True, NO_CHANGES_MESSAGE, current_hashes
             
-            # 无论是否有变化，都强制上传
             if has_changes:
                 self._notify(f"检测到 {len(changed_files)} 个文件变更")
             else:
@@ -183,12 +363,15 @@ class GitManager:
             
             if username and token:
                 auth_url = self._build_auth_url(username, token)
-                with self.repo.config_writer() as config:
-                    config.set_value('remote "origin"', 'url', auth_url)
+                self._username, self._token = username, token
+                # 仅在地址变化时写入，避免每次都重写 git 配置文件
+                if self.repo.remote(name="origin").url != auth_url:
+                    with self.repo.config_writer() as config:
+                        config.set_value('remote "origin"', 'url', auth_url)
             
             self._notify("拉取最新代码...")
             try:
-                self.repo.git.pull("origin", self.branch)
+                self._pull()
             except GitCommandError:
                 self._notify("拉取失败，继续上传...")
             
@@ -202,7 +385,8 @@ class GitManager:
             
             # 始终执行提交和推送（即使没有变化）
             commit_message = f"自动更新 - {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}"
-            success, message = self.commit_and_push(commit_message)
+            changed_names = [f.name for f in changed_files] if has_changes else []
+            success, message = self.commit_and_push(commit_message, changed_names)
             
             if success:
                 return True, message, current_hashes
@@ -2,16 +2,423 @@
 GitHub Uploader - GitHub OAuth认证
 使用GitHub CLI进行认证
 """
+import os
+import re
 import sys
 import json
+import time
+import atexit
+import select
+import socket
+import hashlib
+import shutil
+import tempfile
+import threading
 import subprocess
-from typing import Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import Optional, Callable, Any, Tuple, List, Dict
 from dataclasses import dataclass
-from httpx import Client
+from httpx import Client, ConnectError, HTTPTransport, Limits
 
+try:
+    # httpx 的 HTTP/2 支持依赖 h2 包
+    import h2
+except ImportError:
+    h2 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+import dns_cache
 from credential_manager import credential_manager, GitHubCredential
 
 
+def _detect_proxy() -> Optional[str]:
+    """从环境变量检测代理设置"""
+    http_proxy = os.environ.get('HTTP_PROXY') or os.environ.get('http_proxy')
+    https_proxy = os.environ.get('HTTPS_PROXY') or os.environ.get('https_proxy')
+
+    # 清理代理地址（移除空字符串和无效地址）
+    def clean_proxy(proxy_str):
+        if not proxy_str:
+            return None
+        proxy_str = proxy_str.strip()
+        if not proxy_str or proxy_str == "http://" or proxy_str == "https://":
+            return None
+        return proxy_str
+
+    return clean_proxy(https_proxy) or clean_proxy(http_proxy)
+
+
+class _DnsResetTransport(HTTPTransport):
+    """连接失败时清空 DNS 缓存，下次请求重新解析（例如切换网络或代理后）"""
+
+    def handle_request(self, request):
+        try:
+            return super().handle_request(request)
+        except ConnectError:
+            dns_cache.clear()
+            raise
+
+
+def _create_client(proxy: Optional[str]) -> Client:
+    """创建共享的 httpx.Client：长连接复用，支持时启用 HTTP/2 多路复用"""
+    transport = _DnsResetTransport(
+        http2=h2 is not None,
+        retries=2,
+        limits=Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60),
+        proxy=proxy,
+    )
+    return Client(
+        timeout=30.0,
+        headers={
+            "Accept": "application/vnd.github.v3+json",
+            "User-Agent": "GitHub-Auto-Uploader"
+        },
+        transport=transport,
+    )
+
+
+def _auth_header(access_token: str) -> dict:
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+_REPOS_URL = 'https://api.github.com/user/repos?per_page=100&sort=updated&affiliation=owner,collaborator'
+# 仓库列表最多获取的页数（每页100个）
+MAX_REPO_PAGES = 10
+# 从 Link 响应头中解析最后一页的页码
+_LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+# 仓库列表保留的字段
+_REPO_FIELDS = ('name', 'full_name', 'clone_url', 'default_branch', 'private', 'updated_at')
+_get_repo_fields = itemgetter(*_REPO_FIELDS)
+# 用户信息在进程内的缓存时间（秒）
+USER_INFO_TTL = 600.0
+# API 磁盘缓存最多保留的条目数，超出时淘汰最早获取的条目
+API_CACHE_MAX_ENTRIES = 200
+# API 缓存合并写入的延迟（秒）
+API_CACHE_SAVE_DELAY = 1.0
+# gh 命令输出编码与 subprocess.run 公共参数
+_ENCODING = 'gbk' if sys.platform == 'win32' else 'utf-8'
+_SUBPROCESS_KWARGS = dict(capture_output=True, text=True, encoding=_ENCODING, errors='ignore')
+# gh 可执行文件路径，启动时解析一次；未安装时为 None
+_GH_PATH = shutil.which('gh')
+_GH_NOT_FOUND_ERROR = (
+    "未找到 GitHub CLI (gh)\n\n"
+    "请安装 GitHub CLI: https://cli.github.com/\n"
+    "或者使用其他登录方式"
+)
+# GitHub 连通性检查结果的缓存时间（秒）
+REACHABILITY_TTL = 60.0
+# 浏览器登录的最长等待时间（秒）
+WEB_LOGIN_TIMEOUT = 300
+
+
+def _json_loads(data: bytes) -> Any:
+    """解析 JSON 字节串，优先使用 orjson"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """序列化为紧凑的 UTF-8 JSON 字节串，优先使用 orjson"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _project_repos(data: list) -> list:
+    return [dict(zip(_REPO_FIELDS, _get_repo_fields(repo))) for repo in data]
+
+
+_GRAPHQL_URL = 'https://api.github.com/graphql'
+# 一次查询同时取回仓库及其分支（每个仓库最多100个分支），按更新时间排序与 REST 一致
+_REPOS_WITH_BRANCHES_QUERY = """
+query($cursor: String) {
+  viewer {
+    repositories(first: 100, after: $cursor,
+                 ownerAffiliations: [OWNER, COLLABORATOR],
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        url
+        isPrivate
+        updatedAt
+        defaultBranchRef { name }
+        refs(refPrefix: "refs/heads/", first: 100) { nodes { name } }
+      }
+    }
+  }
+}
+"""
+
+
+def _project_graphql_repo(node: dict) -> dict:
+    """把 GraphQL 仓库节点转换为与 REST 相同的字段，并附带 branches"""
+    default_branch = node.get('defaultBranchRef') or {}
+    refs = node.get('refs') or {}
+    return {
+        'name': node['name'],
+        'full_name': node['nameWithOwner'],
+        'clone_url': node['url'] + '.git',
+        'default_branch': default_branch.get('name', 'main'),
+        'private': node['isPrivate'],
+        'updated_at': node['updatedAt'],
+        'branches': [ref['name'] for ref in refs.get('nodes') or ()],
+    }
+
+
+def _close_client(client: Client):
+    """关闭 HTTP 客户端；退出阶段的异常只会产生噪音，忽略即可"""
+    try:
+        client.close()
+    except Exception:
+        pass
+
+
+def _api_cache_path() -> Path:
+    if sys.platform == 'win32':
+        base = Path(os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local')
+    else:
+        xdg_cache = os.environ.get('XDG_CACHE_HOME')
+        base = Path(xdg_cache) if xdg_cache else Path.home() / '.cache'
+    return base / 'github-uploader' / 'api-cache.json'
+
+
+class ApiCache:
+    """
+    GitHub API 响应的磁盘缓存
+    条目以 SHA-256(url + token) 为键，保存 ETag 和响应内容，
+    再次请求时发送 If-None-Match，304 响应不返回内容也不计入速率限制；
+    修改延迟合并写入磁盘，条目数超过 API_CACHE_MAX_ENTRIES 时淘汰最早获取的条目
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._entries: Optional[dict] = None
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+
+    @staticmethod
+    def make_key(url: str, access_token: str) -> str:
+        return hashlib.sha256(f"{url}\n{access_token}".encode('utf-8')).hexdigest()
+
+    def _ensure_loaded(self) -> dict:
+        # 调用方需持有 self._lock
+        if self._entries is None:
+            try:
+                self._entries = _json_loads(self._path.read_bytes())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            return self._ensure_loaded().get(key)
+
+    def put(self, key: str, entry: dict):
+        with self._lock:
+            entries = self._ensure_loaded()
+            entries[key] = entry
+            if len(entries) > API_CACHE_MAX_ENTRIES:
+                by_age = sorted(entries, key=lambda k: entries[k].get('fetched_at', 0))
+                for old_key in by_age[:len(entries) - API_CACHE_MAX_ENTRIES]:
+                    del entries[old_key]
+            self._dirty = True
+            self._schedule_flush()
+
+    def clear(self):
+        with self._lock:
+            self._cancel_flush()
+            self._dirty = False
+            self._entries = {}
+            try:
+                self._path.unlink()
+            except OSError:
+                pass
+
+    def flush(self):
+        """立即写入尚未落盘的修改（退出前调用）"""
+        with self._lock:
+            self._cancel_flush()
+            if self._dirty:
+                self._write(self._entries)
+
+    def _schedule_flush(self):
+        # 调用方需持有 self._lock；已有待执行的写入时直接并入
+        if self._flush_timer:
+            return
+        self._flush_timer = threading.Timer(API_CACHE_SAVE_DELAY, self._on_flush_timer)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _cancel_flush(self):
+        # 调用方需持有 self._lock
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _on_flush_timer(self):
+        with self._lock:
+            self._flush_timer = None
+            if self._dirty:
+                self._write(self._entries)
+
+    def _write(self, entries: dict):
+        # mkstemp 创建的文件权限为 0o600；写完后原子替换，避免读到半个文件
+        try:
+            self._path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(_json_dumps(entries))
+                os.replace(tmp_path, self._path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self._dirty = False
+        except OSError as e:
+            print(f"写入 API 缓存失败: {e}")
+
+# 代理配置与 HTTP 客户端在进程内共享（httpx.Client 线程安全）
+_PROXY = _detect_proxy()
+_client = _create_client(_PROXY)
+atexit.register(_close_client, _client)
+_api_cache = ApiCache(_api_cache_path())
+# token -> (用户信息, 过期时间)
+_user_info_cache: dict = {}
+
+
+def _wait_for_exit(process: subprocess.Popen, timeout: float) -> bool:
+    """
+    阻塞等待子进程退出，不轮询
+    Linux 使用 pidfd，macOS/BSD 使用 kqueue，Windows 使用 WaitForSingleObject，
+    其他情况退回 Popen.wait
+
+    Returns:
+        进程是否已在超时前退出
+    """
+    try:
+        if hasattr(os, 'pidfd_open'):
+            pidfd = os.pidfd_open(process.pid)
+            try:
+                poller = select.poll()
+                poller.register(pidfd, select.POLLIN)
+                poller.poll(int(timeout * 1000))
+            finally:
+                os.close(pidfd)
+            return process.poll() is not None
+
+        if hasattr(select, 'kqueue'):
+            kq = select.kqueue()
+            try:
+                event = select.kevent(
+                    process.pid,
+                    filter=select.KQ_FILTER_PROC,
+                    flags=select.KQ_EV_ADD | select.KQ_EV_ONESHOT,
+                    fflags=select.KQ_NOTE_EXIT,
+                )
+                kq.control([event], 1, timeout)
+            finally:
+                kq.close()
+            return process.poll() is not None
+
+        if sys.platform == 'win32':
+            import ctypes
+            ctypes.windll.kernel32.WaitForSingleObject(int(process._handle), int(timeout * 1000))
+            return process.poll() is not None
+    except (AttributeError, OSError):
+        # 进程可能已退出（ESRCH）或内核不支持，交给 Popen.wait 处理
+        pass
+
+    try:
+        process.wait(timeout=timeout)
+        return True
+    except subprocess.TimeoutExpired:
+        return False
+
+
+def _read_output(file) -> str:
+    """读取写入临时文件的子进程输出"""
+    file.seek(0)
+    return file.read().decode(_ENCODING, errors='ignore').strip()
+
+
+def _gh_hosts_path() -> Path:
+    """GitHub CLI 保存登录信息的 hosts.yml 路径"""
+    config_dir = os.environ.get('GH_CONFIG_DIR')
+    if config_dir:
+        return Path(config_dir) / 'hosts.yml'
+    if sys.platform == 'win32':
+        return Path(os.environ.get('APPDATA', '')) / 'GitHub CLI' / 'hosts.yml'
+    xdg_config = os.environ.get('XDG_CONFIG_HOME')
+    base = Path(xdg_config) if xdg_config else Path.home() / '.config'
+    return base / 'gh' / 'hosts.yml'
+
+
+def _parse_simple_yaml(text: str) -> dict:
+    """解析 hosts.yml 这类只含嵌套映射和字符串值的 YAML，无需引入 YAML 解析库"""
+    root: dict = {}
+    # (缩进, 映射)，栈顶是当前行的父映射
+    stack = [(-1, root)]
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        indent = len(line) - len(line.lstrip())
+        while stack[-1][0] >= indent:
+            stack.pop()
+        key, _, value = stripped.partition(':')
+        key = key.strip().strip('"\'')
+        value = value.strip()
+        if value:
+            stack[-1][1][key] = value.strip('"\'')
+        else:
+            child: dict = {}
+            stack[-1][1][key] = child
+            stack.append((indent, child))
+    return root
+
+
+def _read_local_token() -> Optional[str]:
+    """
+    不启动 gh 进程，直接从 GitHub CLI 的 hosts.yml 读取当前账号的令牌
+
+    Returns:
+        令牌字符串；未找到或无法确定当前账号时返回None
+        （例如 gh 将令牌保存在系统钥匙串中），由调用方改用 gh auth token
+    """
+    try:
+        hosts = _parse_simple_yaml(_gh_hosts_path().read_text(encoding='utf-8'))
+    except OSError:
+        return None
+
+    host = hosts.get('github.com')
+    if not isinstance(host, dict):
+        return None
+    users = host.get('users')
+    if not isinstance(users, dict):
+        # 旧版单账号格式
+        return host.get('oauth_token') or None
+
+    # 多账号格式：user 为当前账号，顶层 oauth_token 与其对应
+    user = host.get('user')
+    if not isinstance(user, str) or not user:
+        return None
+    entry = users.get(user)
+    token = entry.get('oauth_token') if isinstance(entry, dict) else None
+    return token or host.get('oauth_token') or None
+
+
 @dataclass
 class AuthResult:
     """认证结果"""
@@ -28,39 +435,15 @@ class GitHubAuth:
 
     def __init__(self):
         self._on_auth_complete: Optional[Callable[[AuthResult], None]] = None
+        # 最近一次确认 GitHub 可连接的时间（time.monotonic）
+        self._github_reachable_at = float('-inf')
+        # (凭证对象, 用户信息字典)，凭证对象变化（登录/注销/刷新）时重新生成
+        self._user_info_dict: Optional[Tuple[GitHubCredential, dict]] = None
 
-        # 检测代理设置
-        import os
-        http_proxy = os.environ.get('HTTP_PROXY') or os.environ.get('http_proxy')
-        https_proxy = os.environ.get('HTTPS_PROXY') or os.environ.get('https_proxy')
-
-        # 清理代理地址（移除空字符串和无效地址）
-        def clean_proxy(proxy_str):
-            if not proxy_str:
-                return None
-            proxy_str = proxy_str.strip()
-            if not proxy_str or proxy_str == "http://" or proxy_str == "https://":
-                return None
-            return proxy_str
-
-        http_proxy = clean_proxy(http_proxy)
-        https_proxy = clean_proxy(https_proxy)
-
-        # 保存代理配置
-        self._proxy = https_proxy or http_proxy
+        # 代理配置在模块加载时检测一次
+        self._proxy = _PROXY
         if self._proxy:
             print(f"已配置代理: {self._proxy}")
-
-    def _get_client(self):
-        """创建新的 httpx.Client 实例（线程安全）"""
-        return Client(
-            timeout=30.0,
-            headers={
-                "Accept": "application/vnd.github.v3+json",
-                "User-Agent": "GitHub-Auto-Uploader"
-            },
-            proxy=self._proxy if self._proxy else None
-        )
     
     def is_authenticated(self) -> bool:
         """检查是否已认证"""
@@ -93,14 +476,23 @@ class GitHubAuth:
             if status_callback:
                 status_callback("正在检查GitHub CLI登录状态...")
             
+            # 本地已有令牌时直接验证，无需启动 gh 进程
+            local_token = _read_local_token()
+            if local_token:
+                print("检测到本地 GitHub 令牌，直接验证")
+                if self._complete_with_token(local_token, on_complete, status_callback):
+                    return True
+                if status_callback:
+                    status_callback("本地令牌无效，改用 GitHub CLI 检查登录状态...")
+            
+            if _GH_PATH is None:
+                on_complete(AuthResult(success=False, error=_GH_NOT_FOUND_ERROR))
+                return False
+            
             # 检查是否已登录
-            encoding = 'gbk' if sys.platform == 'win32' else 'utf-8'
             result = subprocess.run(
-                ["gh", "auth", "status"],
-                capture_output=True,
-                text=True,
-                encoding=encoding,
-                errors='ignore',
+                [_GH_PATH, "auth", "status"],
+                **_SUBPROCESS_KWARGS,
                 timeout=10
             )
             
@@ -121,12 +513,7 @@ class GitHubAuth:
                     return False
                 
         except FileNotFoundError:
-            on_complete(AuthResult(
-                success=False,
-                error="未找到 GitHub CLI (gh)\n\n"
-                      "请安装 GitHub CLI: https://cli.github.com/\n"
-                      "或者使用其他登录方式"
-            ))
+            on_complete(AuthResult(success=False, error=_GH_NOT_FOUND_ERROR))
             return False
         except subprocess.TimeoutExpired:
             # 超时也可能是未登录，尝试自动web登录
@@ -151,6 +538,7 @@ class GitHubAuth:
     ) -> bool:
         """自动使用web方式登录GitHub CLI"""
         process = None  # 初始化进程变量，用于异常处理时清理
+        stderr_file = None
 
         try:
             # 先进行网络诊断
@@ -172,23 +560,22 @@ class GitHubAuth:
 
             # 使用web方式启动GitHub CLI登录
             # gh auth login --web --hostname github.com 会打开浏览器，用户在浏览器中完成授权
-            cmd = ["gh", "auth", "login", "--web", "--hostname", "github.com", "--git-protocol", "https"]
+            cmd = [_GH_PATH, "auth", "login", "--web", "--hostname", "github.com", "--git-protocol", "https"]
 
             if status_callback:
                 status_callback("正在启动GitHub CLI web登录...")
                 print(f"执行命令: {' '.join(cmd)}")
 
             # 在新进程中启动登录命令
-            encoding = 'gbk' if sys.platform == 'win32' else 'utf-8'
 
             # Windows下不使用CREATE_NO_WINDOW，让浏览器能正常打开
+            # stdout 丢弃；stderr 写入临时文件而不是管道，输出再多也不会阻塞子进程，
+            # 只在失败时读取用于提示
+            stderr_file = tempfile.TemporaryFile()
             process = subprocess.Popen(
                 cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding=encoding,
-                errors='ignore',
+                stdout=subprocess.DEVNULL,
+                stderr=stderr_file,
             )
 
             if status_callback:
@@ -197,8 +584,7 @@ class GitHubAuth:
             # 检查进程是否启动成功
             if process.poll() is not None:
                 # 进程已经结束
-                stdout, stderr = process.communicate()
-                error_msg = stderr.strip() if stderr else stdout.strip()
+                error_msg = _read_output(stderr_file)
                 if status_callback:
                     status_callback(f"启动失败: {error_msg}")
                 on_complete(AuthResult(
@@ -215,56 +601,27 @@ class GitHubAuth:
                 status_callback("浏览器已打开，请在浏览器中完成GitHub授权...")
                 status_callback("提示：授权成功后程序会自动继续，无需手动操作")
 
-            # 实时读取输出
-            import time
-            start_time = time.time()
-            while True:
-                # 检查进程是否结束
-                if process.poll() is not None:
-                    break
-
-                # 检查超时
-                if time.time() - start_time > 300:
-                    process.terminate()
-                    # 等待进程结束，最多等待 5 秒
-                    try:
-                        process.wait(timeout=5)
-                    except subprocess.TimeoutExpired:
-                        # 如果进程仍然没有结束，强制杀死
-                        process.kill()
-                        process.wait()
-                    break
-
-                # 短暂等待
-                time.sleep(1)
-
-            # 获取进程输出（使用 try-except 捕获 TimeoutExpired）
-            try:
-                stdout, stderr = process.communicate(timeout=5)
-            except subprocess.TimeoutExpired:
-                # 如果 communicate 超时，杀死进程
-                process.kill()
-                stdout, stderr = process.communicate()
-
-            if stderr:
-                print(f"GitHub CLI 错误输出: {stderr}")
-
-            # 登录完成后，重新检查状态并获取token
-            result = subprocess.run(
-                ["gh", "auth", "status"],
-                capture_output=True,
-                text=True,
-                encoding=encoding,
-                errors='ignore',
-                timeout=10
-            )
+            # 阻塞等待进程退出，超时则终止
+            if not _wait_for_exit(process, WEB_LOGIN_TIMEOUT):
+                process.terminate()
+                # 等待进程结束，最多等待 5 秒
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    # 如果进程仍然没有结束，强制杀死
+                    process.kill()
+                    process.wait()
 
-            if result.returncode == 0:
+            # 登录进程的退出码即可判断是否成功，无需再执行 gh auth status
+            if process.returncode == 0:
                 if status_callback:
                     status_callback("登录成功，正在获取Token...")
                 # 调用获取token的方法
                 self._get_gh_cli_token(on_complete, status_callback)
             else:
+                error_output = _read_output(stderr_file)
+                if error_output:
+                    print(f"GitHub CLI 错误输出: {error_output}")
                 if status_callback:
                     status_callback("登录未完成或已取消")
                 on_complete(AuthResult(
@@ -303,48 +660,58 @@ class GitHubAuth:
                     process.wait()
                 except Exception:
                     pass
+            if stderr_file is not None:
+                stderr_file.close()
     
     def _check_github_accessibility(
         self,
         status_callback: Optional[Callable[[str], None]] = None,
     ) -> bool:
-        """检查 GitHub 可访问性"""
-        import socket
-        try:
-            if status_callback:
-                status_callback("正在解析 github.com DNS...")
-
-            # 检查 DNS 解析
-            socket.gethostbyname('github.com')
+        """
+        检查 GitHub 可访问性
+        只建立一次 TCP 连接（配置代理时连接代理），不下载任何内容；
+        成功结果缓存 REACHABILITY_TTL 秒，失败时每次都重新检查
+        """
+        if time.monotonic() - self._github_reachable_at < REACHABILITY_TTL:
+            return True
 
-            if status_callback:
-                status_callback("DNS 解析成功")
+        if self._proxy:
+            proxy = urlsplit(self._proxy)
+            address = (proxy.hostname, proxy.port or 80)
+        else:
+            address = ('api.github.com', 443)
 
-            # 检查 HTTPS 连接
+        try:
             if status_callback:
-                status_callback("正在连接 GitHub...")
+                status_callback(f"正在连接 {address[0]}:{address[1]}...")
 
-            with self._get_client() as client:
-                response = client.get("https://github.com", timeout=10)
+            with socket.create_connection(address, timeout=5):
+                pass
 
-                if response.status_code == 200:
-                    if status_callback:
-                        status_callback("GitHub 连接正常")
-                    return True
-                else:
-                    if status_callback:
-                        status_callback(f"GitHub 返回错误状态码: {response.status_code}")
-                    return False
+            self._github_reachable_at = time.monotonic()
+            if status_callback:
+                status_callback("GitHub 连接正常")
+            return True
 
         except socket.gaierror as e:
             if status_callback:
                 status_callback(f"DNS 解析失败: {e}")
             return False
-        except Exception as e:
+        except OSError as e:
+            # 缓存的地址可能已失效，下次检查重新解析
+            dns_cache.clear()
             if status_callback:
                 status_callback(f"连接 GitHub 失败: {e}")
             return False
     
+    def probe_github(self, timeout: float = 10.0) -> int:
+        """
+        请求 https://github.com 并返回 HTTP 状态码，用于网络测试
+        复用共享的 HTTP 客户端（含代理配置），重复测试无需重新握手
+        """
+        response = _client.get("https://github.com", timeout=timeout)
+        return response.status_code
+    
     def _get_gh_cli_token(
         self,
         on_complete: Callable[[AuthResult], None],
@@ -355,28 +722,29 @@ class GitHubAuth:
             if status_callback:
                 status_callback("正在从 GitHub CLI 获取 Token...")
             
-            # 获取 token
-            encoding = 'gbk' if sys.platform == 'win32' else 'utf-8'
-            result = subprocess.run(
-                ["gh", "auth", "token"],
-                capture_output=True,
-                text=True,
-                encoding=encoding,
-                errors='ignore',
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                error_msg = result.stderr.strip() if result.stderr else "未知错误"
-                if status_callback:
-                    status_callback(f"获取 Token 失败: {error_msg}")
-                on_complete(AuthResult(
-                    success=False,
-                    error=f"获取 GitHub CLI token 失败: {error_msg}\n请确保已在终端中完成 'gh auth login'"
-                ))
-                return False
-            
-            access_token = result.stdout.strip()
+            # 优先直接读取 gh 保存的令牌，读取不到时再调用 gh auth token
+            access_token = _read_local_token()
+            if not access_token:
+                if _GH_PATH is None:
+                    on_complete(AuthResult(success=False, error=_GH_NOT_FOUND_ERROR))
+                    return False
+                result = subprocess.run(
+                    [_GH_PATH, "auth", "token"],
+                    **_SUBPROCESS_KWARGS,
+                    timeout=30
+                )
+                
+                if result.returncode != 0:
+                    error_msg = result.stderr.strip() if result.stderr else "未知错误"
+                    if status_callback:
+                        status_callback(f"获取 Token 失败: {error_msg}")
+                    on_complete(AuthResult(
+                        success=False,
+                        error=f"获取 GitHub CLI token 失败: {error_msg}\n请确保已在终端中完成 'gh auth login'"
+                    ))
+                    return False
+                
+                access_token = result.stdout.strip()
             
             if not access_token:
                 if status_callback:
@@ -389,37 +757,13 @@ class GitHubAuth:
             
             if status_callback:
                 status_callback(f"Token 获取成功，长度: {len(access_token)} 字符")
-                status_callback("正在验证 Token 有效性...")
-            
-            # 获取用户信息
-            user_info = self._get_user_info(access_token, status_callback)
             
-            if not user_info:
+            if not self._complete_with_token(access_token, on_complete, status_callback):
                 on_complete(AuthResult(
                     success=False,
                     error="获取用户信息失败，请检查网络连接或 Token 有效性"
                 ))
                 return False
-            
-            credential = GitHubCredential(
-                access_token=access_token,
-                scope="repo,read:user",
-                username=user_info.get("login"),
-                user_id=user_info.get("id"),
-                avatar_url=user_info.get("avatar_url"),
-            )
-            
-            # 保存凭证
-            credential_manager.save_credential(credential)
-            
-            if status_callback:
-                status_callback(f"Token 验证成功，用户: {user_info.get('login')}")
-                status_callback("正在保存登录信息...")
-            
-            on_complete(AuthResult(
-                success=True,
-                credential=credential
-            ))
             return True
             
         except subprocess.TimeoutExpired:
@@ -435,25 +779,107 @@ class GitHubAuth:
             on_complete(AuthResult(success=False, error=str(e)))
             return False
     
+    def _complete_with_token(
+        self,
+        access_token: str,
+        on_complete: Callable[[AuthResult], None],
+        status_callback: Optional[Callable[[str], None]] = None,
+    ) -> bool:
+        """
+        使用 GET /user 验证令牌，成功时保存凭证并回调
+
+        Returns:
+            令牌是否有效；无效时不会调用 on_complete
+        """
+        if status_callback:
+            status_callback("正在验证 Token 有效性...")
+        
+        user_info = self._get_user_info(access_token, status_callback)
+        if not user_info:
+            return False
+        
+        credential = GitHubCredential(
+            access_token=access_token,
+            scope="repo,read:user",
+            username=user_info.get("login"),
+            user_id=user_info.get("id"),
+            avatar_url=user_info.get("avatar_url"),
+        )
+        
+        # 保存凭证
+        credential_manager.save_credential(credential)
+        
+        if status_callback:
+            status_callback(f"Token 验证成功，用户: {user_info.get('login')}")
+            status_callback("正在保存登录信息...")
+        
+        on_complete(AuthResult(
+            success=True,
+            credential=credential
+        ))
+        return True
+    
+    def _cached_get(
+        self,
+        url: str,
+        access_token: str,
+        transform: Optional[Callable[[Any], Any]] = None,
+    ) -> Tuple[int, Any, str]:
+        """
+        带 ETag 重新验证的 GET 请求
+
+        Args:
+            transform: 缓存前对响应 JSON 的处理（只缓存需要的字段）
+
+        Returns:
+            (状态码, 内容, Link 头)；命中缓存的 304 响应视为 200
+        """
+        key = ApiCache.make_key(url, access_token)
+        cached = _api_cache.get(key)
+        headers = _auth_header(access_token)
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+
+        response = _client.get(url, headers=headers)
+        if response.status_code == 304 and cached:
+            return 200, cached['body'], cached.get('link', '')
+        if response.status_code != 200:
+            return response.status_code, None, ''
+
+        body = _json_loads(response.content)
+        if transform:
+            body = transform(body)
+        link = response.headers.get('link', '')
+        etag = response.headers.get('etag')
+        if etag:
+            _api_cache.put(key, {
+                'etag': etag,
+                'body': body,
+                'link': link,
+                'fetched_at': time.time(),
+            })
+        return 200, body, link
+    
     def _get_user_info(
         self,
         access_token: str,
         status_callback: Optional[Callable[[str], None]] = None,
     ) -> Optional[dict]:
-        """获取GitHub用户信息"""
+        """获取GitHub用户信息（进程内缓存 USER_INFO_TTL 秒）"""
+        cached = _user_info_cache.get(access_token)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
         try:
-            with self._get_client() as client:
-                response = client.get(
-                    "https://api.github.com/user",
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
+            status_code, user_info, _ = self._cached_get("https://api.github.com/user", access_token)
 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    if status_callback:
-                        status_callback(f"获取用户信息失败: HTTP {response.status_code}")
-                    return None
+            if status_code == 200:
+                _user_info_cache[access_token] = (user_info, time.monotonic() + USER_INFO_TTL)
+                return user_info
+            else:
+                if status_callback:
+                    status_callback(f"获取用户信息失败: HTTP {status_code}")
+                return None
         except Exception as e:
             print(f"获取用户信息失败: {e}")
             if status_callback:
@@ -496,20 +922,20 @@ class GitHubAuth:
         success = credential_manager.delete_credential()
         if success:
             print("已登出")
+            _user_info_cache.clear()
+            _api_cache.clear()
+            self._user_info_dict = None
             
             # 同时登出 GitHub CLI
-            try:
-                encoding = 'gbk' if sys.platform == 'win32' else 'utf-8'
-                subprocess.run(
-                    ['gh', 'auth', 'logout', '-h', 'github.com'],
-                    capture_output=True,
-                    text=True,
-                    encoding=encoding,
-                    errors='ignore',
-                    timeout=10
-                )
-            except Exception:
-                pass
+            if _GH_PATH is not None:
+                try:
+                    subprocess.run(
+                        [_GH_PATH, 'auth', 'logout', '-h', 'github.com'],
+                        **_SUBPROCESS_KWARGS,
+                        timeout=10
+                    )
+                except Exception:
+                    pass
             
         return success
     
@@ -525,6 +951,8 @@ class GitHubAuth:
             credential.user_id = user_info.get("id")
             credential.avatar_url = user_info.get("avatar_url")
             credential_manager.save_credential(credential)
+            # 凭证对象被原地修改，身份比较无法发现变化
+            self._user_info_dict = None
         
         return credential
     
@@ -535,75 +963,124 @@ class GitHubAuth:
             return []
 
         try:
-            headers = {
-                'Authorization': f'token {credential.access_token}',
-                'Accept': 'application/vnd.github.v3+json',
-                'User-Agent': 'GitHub-Auto-Uploader'
-            }
-
-            repos = []
-            page = 1
-
-            with self._get_client() as client:
-                while page <= 10:
-                    url = f'https://api.github.com/user/repos?per_page=100&page={page}&sort=updated&affiliation=owner,collaborator'
-                    response = client.get(url, headers=headers)
-
-                    if response.status_code != 200:
-                        break
-
-                    data = response.json()
+            def fetch_page(page: int):
+                return self._cached_get(
+                    f'{_REPOS_URL}&page={page}', credential.access_token, _project_repos
+                )
 
-                    if not data:
-                        break
+            # 先获取第一页，根据 Link 头得知总页数后并发获取其余页面
+            status_code, repos, link = fetch_page(1)
+            if status_code != 200:
+                return []
 
-                    for repo in data:
-                        repos.append({
-                            'name': repo['name'],
-                            'full_name': repo['full_name'],
-                            'clone_url': repo['clone_url'],
-                            'default_branch': repo['default_branch'],
-                            'private': repo['private'],
-                            'updated_at': repo['updated_at']
-                        })
+            pages = [repos]
+            match = _LAST_PAGE_RE.search(link)
+            last_page = min(int(match.group(1)), MAX_REPO_PAGES) if match else 1
 
-                    if len(data) < 100:
-                        break
-                    page += 1
+            if last_page > 1:
+                with ThreadPoolExecutor(max_workers=min(8, last_page - 1)) as executor:
+                    for status_code, repos, _ in executor.map(fetch_page, range(2, last_page + 1)):
+                        if status_code != 200:
+                            break
+                        pages.append(repos)
 
-            return repos
+            return [repo for repos in pages for repo in repos]
 
         except Exception as e:
             print(f"获取仓库列表失败: {e}")
             return []
     
-    def get_branches(self, owner: str, repo: str) -> list:
-        """获取分支列表"""
+    def _get_repos_with_branches_graphql(self, access_token: str) -> Optional[list]:
+        """
+        通过 GraphQL 一次请求获取仓库列表及各仓库的分支（每页100个仓库）
+
+        Returns:
+            仓库列表（每项带 branches）；请求失败时返回 None
+        """
+        repos = []
+        cursor = None
+        for _ in range(MAX_REPO_PAGES):
+            response = _client.post(
+                _GRAPHQL_URL,
+                headers=_auth_header(access_token),
+                json={'query': _REPOS_WITH_BRANCHES_QUERY, 'variables': {'cursor': cursor}},
+            )
+            if response.status_code != 200:
+                print(f"GraphQL 请求失败: HTTP {response.status_code}")
+                return None
+            body = _json_loads(response.content)
+            if body.get('errors') or not body.get('data'):
+                print(f"GraphQL 请求失败: {body.get('errors')}")
+                return None
+
+            connection = body['data']['viewer']['repositories']
+            repos.extend(_project_graphql_repo(node) for node in connection['nodes'])
+            page_info = connection['pageInfo']
+            if not page_info['hasNextPage']:
+                break
+            cursor = page_info['endCursor']
+        return repos
+
+    def get_repositories_with_branches(self) -> list:
+        """
+        获取仓库列表，优先使用 GraphQL 一并取回分支（每项带 branches）
+        GraphQL 失败时退回 REST 仓库列表，此时各项不含 branches，需要再调用 get_branches
+        """
         credential = credential_manager.load_credential()
         if not credential:
             return []
 
         try:
-            headers = {
-                'Authorization': f'token {credential.access_token}',
-                'Accept': 'application/vnd.github.v3+json',
-                'User-Agent': 'GitHub-Auto-Uploader'
-            }
-
-            with self._get_client() as client:
-                response = client.get(
-                    f'https://api.github.com/repos/{owner}/{repo}/branches?per_page=100',
-                    headers=headers
-                )
+            repos = self._get_repos_with_branches_graphql(credential.access_token)
+            if repos is not None:
+                return repos
+        except Exception as e:
+            print(f"GraphQL 获取仓库列表失败: {e}")
+
+        return self.get_repositories()
 
-                if response.status_code == 200:
-                    data = response.json()
-                    return [branch['name'] for branch in data]
+    def _fetch_branches(self, owner: str, repo: str, access_token: str) -> list:
+        status_code, branches, _ = self._cached_get(
+            f'https://api.github.com/repos/{owner}/{repo}/branches?per_page=100',
+            access_token,
+            lambda data: [branch['name'] for branch in data]
+        )
+        return branches if status_code == 200 else []
 
+    def get_branches(self, owner: str, repo: str) -> list:
+        """获取分支列表"""
+        credential = credential_manager.load_credential()
+        if not credential:
             return []
 
+        try:
+            return self._fetch_branches(owner, repo, credential.access_token)
         except Exception:
             return []
+
+    def get_branches_many(self, repos: List[Tuple[str, str]]) -> Dict[Tuple[str, str], list]:
+        """
+        并发获取多个仓库的分支列表
+        请求共用同一个客户端，HTTP/2 下在一条连接上多路复用
+
+        Args:
+            repos: (owner, repo) 列表
+
+        Returns:
+            (owner, repo) -> 分支名列表；获取失败的仓库为空列表
+        """
+        credential = credential_manager.load_credential()
+        if not credential or not repos:
+            return {}
+
+        def fetch(item: Tuple[str, str]) -> list:
+            try:
+                return self._fetch_branches(*item, credential.access_token)
+            except Exception:
+                return []
+
+        with ThreadPoolExecutor(max_workers=min(8, len(repos))) as executor:
+            return dict(zip(repos, executor.map(fetch, repos)))
     
     def get_token(self) -> Optional[str]:
         """获取访问令牌"""
@@ -615,11 +1092,21 @@ class GitHubAuth:
         if not credential:
             return None
         
-        return {
+        cached = self._user_info_dict
+        if cached and cached[0] is credential:
+            return cached[1]
+        
+        user_info = {
             'login': credential.username,
             'id': credential.user_id,
             'avatar_url': credential.avatar_url,
         }
+        self._user_info_dict = (credential, user_info)
+        return user_info
+    
+    def close(self):
+        """退出程序时关闭共享的 HTTP 客户端（重复关闭无副作用）"""
+        _close_client(_client)
 
 
 # 全局认证管理器实例
@@ -6,13 +6,17 @@ os.environ['QT_AUTO_SCREEN_SCALE_FACTOR'] = '1'
 # 抑制 libpng 的 ICC 警告
 os.environ['QT_IMAGEIO_DISABLE_WARNING'] = '1'
 
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import Qt
-from main_window import MainWindow
-
 
 def main():
     print("正在初始化应用程序...")
+
+    # 之后的网络请求共享进程内 DNS 缓存
+    import dns_cache
+    dns_cache.install()
+
+    # Qt 与主窗口在这里才导入，import main 本身不会加载 PyQt6
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import Qt
     
     # 启用高DPI支持
     if hasattr(Qt, 'AA_EnableHighDpiScaling'):
@@ -33,6 +37,7 @@ def main():
     app.setFont(font)
     
     print("创建主窗口...")
+    from main_window import MainWindow
     window = MainWindow()
     print(f"窗口标题: {window.windowTitle()}")
     print(f"窗口大小: {window.size()}")
@@ -1,7 +1,13 @@
+import os
 import sys
+import time
+import socket
+import logging
+import logging.handlers
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Callable, Any
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -10,96 +16,168 @@ from PyQt6.QtWidgets import (
     QMenu, QStyle, QComboBox, QFrame, QSizePolicy, QScrollArea,
     QDateTimeEdit
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QSize, QDateTime
-from PyQt6.QtGui import QAction, QIcon, QFont, QColor, QPalette
+from PyQt6.QtCore import (
+    Qt, QObject, QRunnable, QThread, QThreadPool, pyqtSignal, QTimer, QSize, QDateTime,
+    QRectF
+)
+from PyQt6.QtGui import (
+    QAction, QIcon, QFont, QColor, QPalette, QStandardItemModel, QStandardItem,
+    QPixmap, QPainter, QLinearGradient, QBrush
+)
 
+import dns_cache
 from config_manager import ConfigManager
-from git_manager import GitManager
+from git_manager import GitManager, NO_CHANGES_MESSAGE
 from file_watcher import FileWatcher
 from scheduler import UploadScheduler
-from github_auth import GitHubAuth
+from github_auth import GitHubAuth, AuthResult
+
 
+# 界面线程的诊断输出经内存缓冲批量写出，不在启动和事件处理中同步刷新 stdout；
+# ERROR 及以上立即输出，其余在缓冲满或程序退出时输出
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+logger.addHandler(logging.handlers.MemoryHandler(
+    capacity=100, flushLevel=logging.ERROR, target=logging.StreamHandler(sys.stdout)
+))
+logger.propagate = False
 
-class AuthWorker(QThread):
+
+class WorkerSignals(QObject):
+    """QRunnable 不是 QObject，无法发出信号，由此对象代为发出"""
     progress = pyqtSignal(str)
-    finished_signal = pyqtSignal(object)  # AuthResult
+    finished_signal = pyqtSignal(object)
+
+
+class Task(QRunnable):
+    """
+    在 QThreadPool 中执行的后台任务
+    fn 接收进度回调，返回值（或抛出的异常）通过 finished_signal 发出
+    """
     
-    def __init__(self, auth: GitHubAuth):
+    def __init__(self, fn: Callable[[Callable[[str], None]], Any]):
         super().__init__()
-        self.auth = auth
+        self.fn = fn
+        # 在界面线程创建，信号对象属于界面线程；发出 finished_signal 后由界面线程的事件循环删除
+        self.signals = WorkerSignals()
+        self.signals.finished_signal.connect(self.signals.deleteLater)
     
     def run(self):
         try:
-            def status_callback(msg):
-                self.progress.emit(msg)
-            
-            def on_complete(result):
-                self.finished_signal.emit(result)
-            
-            # 启用自动web登录
-            self.auth.start_gh_cli_auth(on_complete, status_callback, auto_web_login=True)
+            result = self.fn(self.signals.progress.emit)
         except Exception as e:
-            from github_auth import AuthResult
-            self.finished_signal.emit(AuthResult(success=False, error=f"授权过程出错: {str(e)}"))
+            logger.error("后台任务出错: %s", e)
+            result = e
+        self.signals.finished_signal.emit(result)
+    
+    def release(self):
+        """断开信号，任务完成或被放弃时调用；被放弃的任务结束后不再回调"""
+        try:
+            for signal in (self.signals.progress, self.signals.finished_signal):
+                try:
+                    signal.disconnect()
+                except TypeError:
+                    pass
+            # 保留删除信号对象的连接，被放弃的任务结束后同样释放
+            self.signals.finished_signal.connect(self.signals.deleteLater)
+        except RuntimeError:
+            # 任务已结束，信号对象已被删除
+            pass
 
 
-class UploadWorker(QThread):
-    progress = pyqtSignal(str)
-    finished_signal = pyqtSignal(bool, str)
-    
-    def __init__(self, git_manager: GitManager, source_files: List[Path], 
-                 stored_hashes: dict, username: str, token: str):
-        super().__init__()
-        self.git_manager = git_manager
-        self.source_files = source_files
-        self.stored_hashes = stored_hashes
-        self.username = username
-        self.token = token
-        self.git_manager.set_progress_callback(self._on_progress)
-    
-    def _on_progress(self, message: str):
-        self.progress.emit(message)
-    
-    def run(self):
-        success, message, new_hashes = self.git_manager.sync_and_upload(
-            self.source_files, self.stored_hashes, self.username, self.token
-        )
-        self.finished_signal.emit(success, message)
-        self.new_hashes = new_hashes
+def _task_result(result) -> tuple:
+    """把任务抛出的异常转换为 (False, 错误信息, ...) 形式的结果"""
+    if isinstance(result, Exception):
+        return False, str(result), None
+    return result
 
 
-class InitWorker(QThread):
-    progress = pyqtSignal(str)
-    finished_signal = pyqtSignal(bool, str)
+def _set_label_text(label: QLabel, text: str):
+    """文本不变时不调用 setText，避免重新布局和重绘"""
+    if label.text() != text:
+        label.setText(text)
+
+
+def _set_label_state(label: QLabel, state: str):
+    """切换状态标签的 state 属性，并让全局样式表重新匹配"""
+    label.setProperty("state", state)
+    style = label.style()
+    style.unpolish(label)
+    style.polish(label)
+
+
+@contextmanager
+def _updates_suspended(widget: QWidget):
+    """批量修改子控件期间暂停重绘，结束后统一重绘一次"""
+    widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        widget.setUpdatesEnabled(True)
+
+
+class GradientHeader(QFrame):
+    """顶部标题栏：渐变背景按当前尺寸渲染一次并缓存为 QPixmap，重绘时直接贴图"""
+    STOPS = ((0.0, "#4361ee"), (0.5, "#3a0ca3"), (1.0, "#7209b7"))
+    RADIUS = 16
     
-    def __init__(self, git_manager: GitManager, username: str, email: str, token: str):
-        super().__init__()
-        self.git_manager = git_manager
-        self.username = username
-        self.email = email
-        self.token = token
-        self.git_manager.set_progress_callback(self._on_progress)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._background: Optional[QPixmap] = None
     
-    def _on_progress(self, message: str):
-        self.progress.emit(message)
+    def resizeEvent(self, event):
+        self._background = None
+        super().resizeEvent(event)
     
-    def run(self):
-        success, message = self.git_manager.init_repository(
-            self.username, self.email, self.token
-        )
-        self.finished_signal.emit(success, message)
+    def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        if self._background is None or self._background.devicePixelRatio() != dpr:
+            self._background = self._render_background(dpr)
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._background)
+        painter.end()
+    
+    def _render_background(self, dpr: float) -> QPixmap:
+        pixmap = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        gradient = QLinearGradient(0, 0, self.width(), 0)
+        for position, color in self.STOPS:
+            gradient.setColorAt(position, QColor(color))
+        
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QBrush(gradient))
+        painter.drawRoundedRect(QRectF(self.rect()), self.RADIUS, self.RADIUS)
+        painter.end()
+        return pixmap
 
 
 class StyledButton(QPushButton):
+    # 界面中使用的按钮颜色
+    PALETTE = ("#4361ee", "#3a0ca3", "#7209b7", "#f72585", "#4cc9f0", "#6c757d")
+    # 悬停/按下时亮度的调整量（HSL 中的 L）
+    HOVER_LIGHTNESS = 0.08
+    # 基础色 -> 样式表，同色按钮共用同一个字符串
+    _STYLE_CACHE: Dict[str, str] = {}
+    
     def __init__(self, text, color="#4361ee", parent=None):
         super().__init__(text, parent)
         self._base_color = color
         self._update_style()
     
     def _update_style(self):
-        self.setStyleSheet(f"""
+        self.setStyleSheet(self._style_for(self._base_color))
+    
+    @classmethod
+    def _style_for(cls, color: str) -> str:
+        style = cls._STYLE_CACHE.get(color)
+        if style is None:
+            style = cls._STYLE_CACHE[color] = f"""
             QPushButton {{
-                background-color: {self._base_color};
+                background-color: {color};
                 color: white;
                 border: none;
                 padding: 12px 24px;
@@ -108,43 +186,377 @@ class StyledButton(QPushButton):
                 font-weight: 600;
             }}
             QPushButton:hover {{
-                background-color: {self._lighten_color(self._base_color)};
+                background-color: {cls._lighten_color(color)};
             }}
             QPushButton:pressed {{
-                background-color: {self._darken_color(self._base_color)};
+                background-color: {cls._darken_color(color)};
             }}
             QPushButton:disabled {{
                 background-color: #dee2e6;
                 color: #adb5bd;
             }}
-        """)
+        """
+        return style
     
     @staticmethod
-    def _lighten_color(hex_color):
-        color_map = {
-            "#4361ee": "#5a73ff",
-            "#3a0ca3": "#4d1ab8",
-            "#7209b7": "#8a2bc7",
-            "#f72585": "#ff4d9e",
-            "#4cc9f0": "#6dd6f3",
-            "#6c757d": "#868e96"
-        }
-        return color_map.get(hex_color, hex_color)
+    def _adjust_lightness(hex_color: str, delta: float) -> str:
+        color = QColor(hex_color)
+        h, s, l, a = color.getHslF()
+        # 无彩色的色相为 -1
+        color.setHslF(max(h, 0.0), s, min(max(l + delta, 0.0), 1.0), a)
+        return color.name()
     
-    @staticmethod
-    def _darken_color(hex_color):
-        color_map = {
-            "#4361ee": "#3651d9",
-            "#3a0ca3": "#2d0a8e",
-            "#7209b7": "#5a0797",
-            "#f72585": "#d61d6e",
-            "#4cc9f0": "#3ab0d0",
-            "#6c757d": "#5c636a"
-        }
-        return color_map.get(hex_color, hex_color)
+    @classmethod
+    def _lighten_color(cls, hex_color):
+        return cls._adjust_lightness(hex_color, cls.HOVER_LIGHTNESS)
+    
+    @classmethod
+    def _darken_color(cls, hex_color):
+        return cls._adjust_lightness(hex_color, -cls.HOVER_LIGHTNESS)
+
+
+# 预先生成常用颜色的样式表
+for _color in StyledButton.PALETTE:
+    StyledButton._style_for(_color)
+del _color
+
+
+# 标题字体（模块级共享，避免每次构建界面时重复创建）
+TITLE_FONT = QFont()
+TITLE_FONT.setPointSize(24)
+TITLE_FONT.setBold(True)
+
+
+# 全局样式表，在 QApplication 上设置一次；
+# 个别控件通过 objectName 和动态属性选择样式，不再各自调用 setStyleSheet
+GLOBAL_QSS = """
+    QMainWindow {
+        background-color: #f8f9fa;
+    }
+    QGroupBox {
+        font-weight: 600;
+        border: none;
+        border-radius: 12px;
+        margin-top: 16px;
+        padding: 20px;
+        background-color: white;
+        color: #1a1a2e;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 20px;
+        padding: 0 12px;
+        color: #1a1a2e;
+        font-size: 15px;
+        font-weight: 700;
+    }
+    QLabel {
+        color: #2d3436;
+        font-size: 14px;
+    }
+    QLineEdit {
+        padding: 12px 16px;
+        border: 2px solid #e9ecef;
+        border-radius: 8px;
+        font-size: 14px;
+        background-color: #f8f9fa;
+        min-height: 24px;
+        selection-background-color: #4361ee;
+    }
+    QLineEdit:focus {
+        border-color: #4361ee;
+        background-color: white;
+    }
+    QLineEdit:hover {
+        border-color: #ced4da;
+    }
+    QComboBox {
+        padding: 12px 16px;
+        border: 2px solid #e9ecef;
+        border-radius: 8px;
+        font-size: 14px;
+        background-color: #f8f9fa;
+        min-height: 24px;
+        min-width: 250px;
+    }
+    QComboBox:focus {
+        border-color: #4361ee;
+    }
+    QComboBox:hover {
+        border-color: #ced4da;
+    }
+    QComboBox::drop-down {
+        border: none;
+        width: 36px;
+    }
+    QComboBox::down-arrow {
+        image: none;
+        border-left: 6px solid transparent;
+        border-right: 6px solid transparent;
+        border-top: 7px solid #6c757d;
+        margin-right: 12px;
+    }
+    QComboBox QAbstractItemView {
+        border: 2px solid #e9ecef;
+        border-radius: 8px;
+        background-color: white;
+        selection-background-color: #4361ee;
+        selection-color: white;
+        padding: 8px;
+    }
+    QSpinBox {
+        padding: 12px 16px;
+        border: 2px solid #e9ecef;
+        border-radius: 8px;
+        font-size: 14px;
+        background-color: #f8f9fa;
+        min-height: 24px;
+    }
+    QSpinBox:focus {
+        border-color: #4361ee;
+    }
+    QSpinBox:hover {
+        border-color: #ced4da;
+    }
+    QCheckBox {
+        font-size: 14px;
+        spacing: 10px;
+        color: #2d3436;
+    }
+    QCheckBox::indicator {
+        width: 22px;
+        height: 22px;
+        border-radius: 6px;
+        border: 2px solid #e9ecef;
+        background-color: #f8f9fa;
+    }
+    QCheckBox::indicator:hover {
+        border-color: #ced4da;
+    }
+    QCheckBox::indicator:checked {
+        background-color: #4361ee;
+        border-color: #4361ee;
+    }
+    QPlainTextEdit {
+        border: 2px solid #e9ecef;
+        border-radius: 8px;
+        padding: 12px;
+        font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+        font-size: 13px;
+        background-color: #f8f9fa;
+        selection-background-color: #4361ee;
+    }
+    QPlainTextEdit:focus {
+        border-color: #4361ee;
+        background-color: white;
+    }
+    QScrollArea {
+        border: none;
+        background-color: transparent;
+    }
+    QScrollBar:vertical {
+        border: none;
+        background: #f1f3f5;
+        width: 12px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:vertical {
+        background: #adb5bd;
+        border-radius: 6px;
+        min-height: 30px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background: #868e96;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+    QScrollBar:horizontal {
+        border: none;
+        background: #f1f3f5;
+        height: 12px;
+        border-radius: 6px;
+    }
+    QScrollBar::handle:horizontal {
+        background: #adb5bd;
+        border-radius: 6px;
+        min-width: 30px;
+    }
+    QScrollBar::handle:horizontal:hover {
+        background: #868e96;
+    }
+    QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
+        width: 0px;
+    }
+    /* 卡片 */
+    QGroupBox#card {
+        font-weight: 700;
+        border-radius: 16px;
+        margin-top: 20px;
+        padding: 24px;
+    }
+    QGroupBox#card::title {
+        left: 24px;
+        padding: 0 16px;
+        font-size: 16px;
+    }
+    /* 顶部标题栏（背景由 GradientHeader 绘制） */
+    QLabel#headerTitle {
+        color: white;
+    }
+    QLabel#headerSubtitle {
+        color: rgba(255,255,255,0.95);
+        font-size: 15px;
+    }
+    QFrame#authInfoFrame {
+        background-color: #f8f9fa;
+        border-radius: 8px;
+        padding: 16px;
+    }
+    QLabel#fieldLabel {
+        font-weight: 600;
+    }
+    QLabel#hintLabel {
+        color: #6c757d;
+        font-size: 13px;
+        padding: 8px 0;
+    }
+    /* 状态标签，state 属性：active 运行中/已登录，idle 已停止/已登出 */
+    QLabel#statusLabel {
+        font-size: 15px;
+        color: #6c757d;
+        font-weight: 500;
+    }
+    QLabel#statusLabel[state="active"] {
+        font-size: 14px;
+        color: #4CAF50;
+        font-weight: bold;
+    }
+    QLabel#statusLabel[state="idle"] {
+        font-size: 14px;
+        color: #666;
+        font-weight: normal;
+    }
+    QLabel#statusLabel[state="success"] {
+        color: #28a745;
+    }
+    QLabel#statusLabel[state="error"] {
+        color: #dc3545;
+    }
+    /* 托盘菜单 */
+    QMenu#trayMenu {
+        background-color: white;
+        border: 1px solid #e0e0e0;
+        padding: 5px;
+    }
+    QMenu#trayMenu::item {
+        padding: 8px 25px;
+        border-radius: 4px;
+    }
+    QMenu#trayMenu::item:selected {
+        background-color: #2196F3;
+        color: white;
+    }
+"""
+
+
+# 登录帮助对话框的内容
+_LOGIN_HELP_TEXT = """GitHub CLI 登录帮助
+
+【推荐方式】浏览器登录（自动）
+1. 点击"打开浏览器登录"按钮
+2. 浏览器会自动打开 GitHub 授权页面
+3. 在浏览器中登录你的 GitHub 账号
+4. 授权成功后，程序会自动获取登录状态
+
+【备用方式】终端登录
+1. 点击"打开终端登录"按钮
+2. 在终端中执行：gh auth login
+3. 按照提示选择：
+   - What account do you want to log into? -> GitHub.com
+   - What is your preferred protocol? -> HTTPS
+   - Authenticate Git with your GitHub credentials? -> Yes
+   - How would you like to authenticate? -> Login with a web browser
+
+【常见问题排查】
+
+⚠️ 错误：error connecting to github.com
+
+这个错误表示无法连接到 GitHub，请按以下步骤排查：
+
+1. 网络连接检查
+   - 在浏览器中打开 https://github.com 测试
+   - 确认可以正常访问
+
+2. 代理配置（如果需要）
+   如果您使用代理，请配置环境变量：
+   
+   在 PowerShell 中：
+   $env:HTTP_PROXY="http://proxy.example.com:port"
+   $env:HTTPS_PROXY="http://proxy.example.com:port"
+   
+   在 CMD 中：
+   set HTTP_PROXY=http://proxy.example.com:port
+   set HTTPS_PROXY=http://proxy.example.com:port
+   
+   或者为 Git 配置代理：
+   git config --global http.proxy http://proxy.example.com:port
+   git config --global https.proxy http://proxy.example.com:port
+
+3. 检查防火墙/安全软件
+   - 确保防火墙允许访问 GitHub
+   - 检查杀毒软件是否阻止连接
+   - 尝试临时关闭安全软件测试
+
+4. DNS 解析问题
+   - 尝试使用公共 DNS 服务器：
+     * 8.8.8.8 (Google DNS)
+     * 1.1.1.1 (Cloudflare DNS)
+   - 修改网络适配器的 DNS 设置
+
+5. 检查 VPN/代理软件
+   - 关闭所有 VPN 软件
+   - 关闭其他代理工具（如 Clash、V2Ray 等）
+   - 如果必须使用代理，请确保配置正确
+
+6. GitHub 服务状态
+   - 访问 https://githubstatus.com
+   - 确认 GitHub 服务是否正常运行
+
+7. 其他问题
+   - 确认系统时间是否正确
+   - 尝试重启计算机
+   - 检查是否有其他程序占用端口
+
+【手动验证连接】
+在终端中执行以下命令测试：
+ping github.com
+curl -I https://github.com
+
+【快速解决方案】
+如果以上方法都无法解决，可以尝试：
+1. 使用手机热点连接网络
+2. 更换网络环境
+3. 联系网络管理员"""
 
 
 class MainWindow(QMainWindow):
+    # 窗口移动/缩放停止多久后保存位置（毫秒）
+    GEOMETRY_SAVE_DELAY = 2000
+    # 状态刷新间隔（毫秒）：窗口显示 / 窗口隐藏；调度未运行时不刷新
+    STATUS_INTERVAL = 1000
+    STATUS_INTERVAL_HIDDEN = 30000
+    # 日志批量追加的间隔（毫秒）
+    LOG_FLUSH_INTERVAL = 50
+    # 界面变化触发的配置保存，在此时间内（毫秒）的多次变化只保存一次
+    CONFIG_SAVE_DELAY = 500
+    # 仓库列表不含分支时（REST），后台预取分支的仓库数
+    BRANCH_PREFETCH_COUNT = 10
+    # 托盘图标，首次创建托盘时从样式获取一次，之后复用
+    _TRAY_ICON: Optional[QIcon] = None
+    # 文件监控在 threading.Timer 线程中回调，经此信号转到界面线程处理
+    file_changed = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.config_manager = ConfigManager()
@@ -152,11 +564,50 @@ class MainWindow(QMainWindow):
         self.git_manager: Optional[GitManager] = None
         self.file_watcher = FileWatcher()
         self.scheduler = UploadScheduler()
-        self.upload_worker: Optional[UploadWorker] = None
-        self.init_worker: Optional[InitWorker] = None
-        self.auth_worker: Optional[AuthWorker] = None
+        # 后台任务线程池，保留部分核心给界面线程
+        self._bg_pool = QThreadPool(self)
+        self._bg_pool.setMaxThreadCount(max(2, QThread.idealThreadCount() - 2))
+        # 正在执行的后台任务，完成后置为 None
+        self.upload_worker: Optional[Task] = None
+        self.init_worker: Optional[Task] = None
+        self.auth_worker: Optional[Task] = None
+        self.repos_worker: Optional[Task] = None
+        self.network_test_worker: Optional[Task] = None
+        self.branches_worker: Optional[Task] = None
+        # 正在等待分支列表的已选仓库
+        self._branches_pending: Optional[str] = None
         self.tray_icon: Optional[QSystemTrayIcon] = None
         self._repos: List[dict] = []
+        # full_name -> 仓库信息，与 self._repos 同步更新
+        self._repos_by_name: Dict[str, dict] = {}
+        # 标签上当前显示的数值，未变化时不重新格式化文本
+        self._last_stats: Optional[tuple] = None
+        self._last_countdown: Optional[tuple] = None
+        
+        # 窗口移动/缩放停止后才保存位置，拖动过程中只重启同一个定时器
+        self._last_saved_geom = None
+        self._geom_timer = QTimer(self)
+        self._geom_timer.setSingleShot(True)
+        self._geom_timer.timeout.connect(self._flush_geometry)
+        
+        # 连续的界面变化（选择仓库、浏览文件夹等）合并为一次配置保存
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self._do_save_config)
+        
+        # 日志先缓存，每 LOG_FLUSH_INTERVAL 毫秒批量追加一次，避免逐条重新布局
+        self._log_buffer: List[str] = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+        # (秒, "时:分:秒")，同一秒内的多条日志复用格式化好的时间戳
+        self._log_timestamp = (-1, "")
+        self.file_changed.connect(self._on_file_changed, Qt.ConnectionType.QueuedConnection)
+        
+        # 状态刷新使用 startTimer/timerEvent，无需单独的 QTimer 对象
+        self._status_timer_active = False
+        self._status_timer_id = 0
+        self._status_timer_interval = 0
         
         self.setWindowTitle("GitHub自动上传工具")
         self.setMinimumSize(1100, 900)
@@ -166,33 +617,38 @@ class MainWindow(QMainWindow):
         
         self._setup_styles()
         self._setup_ui()
+        
+        # 强制显示窗口（确保可见）
+        logger.debug("强制显示窗口...")
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        
+        # 其余界面在首次绘制之后构建
+        QTimer.singleShot(0, self._finish_setup)
+    
+    def _finish_setup(self):
+        self._setup_ui_deferred()
         self._setup_tray()
         self._load_config()
         self._setup_auto_check()
+        logger.debug("窗口初始化完成")
         
         # 检查认证状态
         is_auth = self.github_auth.is_authenticated()
-        print(f"认证状态: {is_auth}")
-        
-        # 强制显示窗口（确保可见）
-        print("强制显示窗口...")
-        self.show()
-        self.raise_()
-        self.activateWindow()
-        print("窗口初始化完成")
+        logger.debug("认证状态: %s", is_auth)
         
         # 延迟加载仓库列表（在窗口显示后）
         if is_auth:
-            print("将在窗口显示后加载仓库列表...")
+            logger.debug("将在窗口显示后加载仓库列表...")
             QTimer.singleShot(100, self._load_repositories)  # 100ms后加载
         else:
-            print("未登录，跳过自动加载仓库列表")
+            logger.debug("未登录，跳过自动加载仓库列表")
     
     def _restore_window_geometry(self):
         config = self.config_manager.config
         
         # 获取屏幕信息
-        from PyQt6.QtWidgets import QApplication
         screen = QApplication.primaryScreen()
         screen_geometry = screen.availableGeometry()
         
@@ -205,7 +661,7 @@ class MainWindow(QMainWindow):
             x > screen_geometry.right() or
             y < screen_geometry.top() or 
             y > screen_geometry.bottom()):
-            print(f"警告: 窗口位置 ({x}, {y}) 不在屏幕内，重置到中心")
+            logger.warning("窗口位置 (%s, %s) 不在屏幕内，重置到中心", x, y)
             x = (screen_geometry.width() - width) // 2 + screen_geometry.left()
             y = (screen_geometry.height() - height) // 2 + screen_geometry.top()
             config.window_x = x
@@ -217,242 +673,53 @@ class MainWindow(QMainWindow):
         if config.window_maximized:
             self.showMaximized()
         
-        print(f"窗口位置: ({self.x()}, {self.y()})")
-        print(f"窗口大小: {self.width()}x{self.height()}")
+        logger.debug("窗口位置: (%s, %s)", self.x(), self.y())
+        logger.debug("窗口大小: %sx%s", self.width(), self.height())
     
-    def _save_window_geometry(self):
-        config = self.config_manager.config
-        if not self.isMaximized():
-            config.window_x = self.x()
-            config.window_y = self.y()
-            config.window_width = self.width()
-            config.window_height = self.height()
-        config.window_maximized = self.isMaximized()
-        self.config_manager.save()
+    def _mark_geometry_dirty(self):
+        """窗口位置已变化，停止变化 GEOMETRY_SAVE_DELAY 毫秒后保存"""
+        self._geom_timer.start(self.GEOMETRY_SAVE_DELAY)
     
-    def closeEvent(self, event):
-        self._cleanup()
-        super().closeEvent(event)
-
-    def _cleanup(self):
-        """清理资源，防止内存泄漏"""
-        # 停止所有定时器
-        if hasattr(self, 'status_timer'):
-            self.status_timer.stop()
-        if hasattr(self, '_resize_timer'):
-            self._resize_timer.stop()
-        if hasattr(self, '_move_timer'):
-            self._move_timer.stop()
-
-        # 停止并清理所有 Worker
-        if self.upload_worker and self.upload_worker.isRunning():
-            self.upload_worker.terminate()
-            self.upload_worker.wait(2000)  # 等待最多 2 秒
-        if self.init_worker and self.init_worker.isRunning():
-            self.init_worker.terminate()
-            self.init_worker.wait(2000)
-        if self.auth_worker and self.auth_worker.isRunning():
-            self.auth_worker.terminate()
-            self.auth_worker.wait(2000)
-
-        # 停止文件监控
-        if self.file_watcher:
-            self.file_watcher.stop()
-
-        # 停止调度器
-        if self.scheduler:
-            self.scheduler.stop()
-
-        # 清理系统托盘图标
-        if self.tray_icon:
-            self.tray_icon.hide()
-
-        # 保存窗口几何信息
-        self._save_window_geometry()
+    def _flush_geometry(self, force: bool = False):
+        """
+        保存窗口位置
+        
+        Args:
+            force: 跳过防抖立即写入磁盘（关闭、最小化到托盘时使用）
+        """
+        if force:
+            self._geom_timer.stop()
+        
+        geom = (self.x(), self.y(), self.width(), self.height(), self.isMaximized())
+        if geom != self._last_saved_geom:
+            self._last_saved_geom = geom
+            config = self.config_manager.config
+            if not self.isMaximized():
+                config.window_x = self.x()
+                config.window_y = self.y()
+                config.window_width = self.width()
+                config.window_height = self.height()
+            config.window_maximized = self.isMaximized()
+            self.config_manager.save()
+        
+        if force:
+            self.config_manager.flush()
     
     def resizeEvent(self, event):
         super().resizeEvent(event)
         # 延迟保存，避免频繁写入
-        if hasattr(self, '_resize_timer'):
-            self._resize_timer.stop()
-        self._resize_timer = QTimer(self)
-        self._resize_timer.setSingleShot(True)
-        self._resize_timer.timeout.connect(self._save_window_geometry)
-        self._resize_timer.start(500)
+        self._mark_geometry_dirty()
     
     def moveEvent(self, event):
         super().moveEvent(event)
         # 延迟保存
-        if hasattr(self, '_move_timer'):
-            self._move_timer.stop()
-        self._move_timer = QTimer(self)
-        self._move_timer.setSingleShot(True)
-        self._move_timer.timeout.connect(self._save_window_geometry)
-        self._move_timer.start(500)
+        self._mark_geometry_dirty()
     
     def _setup_styles(self):
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f8f9fa;
-            }
-            QGroupBox {
-                font-weight: 600;
-                border: none;
-                border-radius: 12px;
-                margin-top: 16px;
-                padding: 20px;
-                background-color: white;
-                color: #1a1a2e;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 20px;
-                padding: 0 12px;
-                color: #1a1a2e;
-                font-size: 15px;
-                font-weight: 700;
-            }
-            QLabel {
-                color: #2d3436;
-                font-size: 14px;
-            }
-            QLineEdit {
-                padding: 12px 16px;
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                font-size: 14px;
-                background-color: #f8f9fa;
-                min-height: 24px;
-                selection-background-color: #4361ee;
-            }
-            QLineEdit:focus {
-                border-color: #4361ee;
-                background-color: white;
-            }
-            QLineEdit:hover {
-                border-color: #ced4da;
-            }
-            QComboBox {
-                padding: 12px 16px;
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                font-size: 14px;
-                background-color: #f8f9fa;
-                min-height: 24px;
-                min-width: 250px;
-            }
-            QComboBox:focus {
-                border-color: #4361ee;
-            }
-            QComboBox:hover {
-                border-color: #ced4da;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 36px;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 6px solid transparent;
-                border-right: 6px solid transparent;
-                border-top: 7px solid #6c757d;
-                margin-right: 12px;
-            }
-            QComboBox QAbstractItemView {
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                background-color: white;
-                selection-background-color: #4361ee;
-                selection-color: white;
-                padding: 8px;
-            }
-            QSpinBox {
-                padding: 12px 16px;
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                font-size: 14px;
-                background-color: #f8f9fa;
-                min-height: 24px;
-            }
-            QSpinBox:focus {
-                border-color: #4361ee;
-            }
-            QSpinBox:hover {
-                border-color: #ced4da;
-            }
-            QCheckBox {
-                font-size: 14px;
-                spacing: 10px;
-                color: #2d3436;
-            }
-            QCheckBox::indicator {
-                width: 22px;
-                height: 22px;
-                border-radius: 6px;
-                border: 2px solid #e9ecef;
-                background-color: #f8f9fa;
-            }
-            QCheckBox::indicator:hover {
-                border-color: #ced4da;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #4361ee;
-                border-color: #4361ee;
-            }
-            QPlainTextEdit {
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                padding: 12px;
-                font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
-                font-size: 13px;
-                background-color: #f8f9fa;
-                selection-background-color: #4361ee;
-            }
-            QPlainTextEdit:focus {
-                border-color: #4361ee;
-                background-color: white;
-            }
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #f1f3f5;
-                width: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:vertical {
-                background: #adb5bd;
-                border-radius: 6px;
-                min-height: 30px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #868e96;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QScrollBar:horizontal {
-                border: none;
-                background: #f1f3f5;
-                height: 12px;
-                border-radius: 6px;
-            }
-            QScrollBar::handle:horizontal {
-                background: #adb5bd;
-                border-radius: 6px;
-                min-width: 30px;
-            }
-            QScrollBar::handle:horizontal:hover {
-                background: #868e96;
-            }
-            QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
-                width: 0px;
-            }
-        """)
+        QApplication.instance().setStyleSheet(GLOBAL_QSS)
     
     def _setup_ui(self):
+        """构建首屏界面：标题栏和账号、文件夹、仓库、定时设置卡片"""
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
         main_layout = QVBoxLayout(central_widget)
@@ -469,29 +736,20 @@ class MainWindow(QMainWindow):
         scroll_layout.setContentsMargins(0, 0, 0, 0)
         
         # 顶部标题栏
-        header_frame = QFrame()
-        header_frame.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #4361ee, stop:0.5 #3a0ca3, stop:1 #7209b7);
-                border-radius: 16px;
-            }
-        """)
+        header_frame = GradientHeader()
+        header_frame.setObjectName("headerFrame")
         header_layout = QVBoxLayout(header_frame)
         header_layout.setContentsMargins(32, 28, 32, 28)
         header_layout.setSpacing(8)
         
         title_label = QLabel("GitHub 自动上传工具")
-        title_font = QFont()
-        title_font.setPointSize(24)
-        title_font.setBold(True)
-        title_label.setFont(title_font)
-        title_label.setStyleSheet("color: white;")
+        title_label.setFont(TITLE_FONT)
+        title_label.setObjectName("headerTitle")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         header_layout.addWidget(title_label)
         
         subtitle_label = QLabel("智能同步配置文件到 GitHub 仓库")
-        subtitle_label.setStyleSheet("color: rgba(255,255,255,0.95); font-size: 15px;")
+        subtitle_label.setObjectName("headerSubtitle")
         subtitle_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         header_layout.addWidget(subtitle_label)
         
@@ -515,18 +773,12 @@ class MainWindow(QMainWindow):
         auth_layout.setSpacing(16)
         
         auth_info_frame = QFrame()
-        auth_info_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border-radius: 8px;
-                padding: 16px;
-            }
-        """)
+        auth_info_frame.setObjectName("authInfoFrame")
         auth_info_layout = QHBoxLayout(auth_info_frame)
         auth_info_layout.setContentsMargins(16, 12, 16, 12)
         
         self.auth_status_label = QLabel("状态: 未登录")
-        self.auth_status_label.setStyleSheet("font-size: 15px; color: #6c757d; font-weight: 500;")
+        self.auth_status_label.setObjectName("statusLabel")
         auth_info_layout.addWidget(self.auth_status_label)
         auth_info_layout.addStretch()
         
@@ -572,7 +824,7 @@ class MainWindow(QMainWindow):
         folder_layout.addLayout(folder_input_layout)
         
         folder_hint = QLabel("💡 支持的文件: ACL4SSR_Online_FullyamI, all.yaml, base64.txt, bdg.yaml, mihomo.yaml")
-        folder_hint.setStyleSheet("color: #6c757d; font-size: 13px; padding: 8px 0;")
+        folder_hint.setObjectName("hintLabel")
         folder_layout.addWidget(folder_hint)
         
         folder_card.setLayout(folder_layout)
@@ -594,11 +846,13 @@ class MainWindow(QMainWindow):
         
         repo_label = QLabel("选择仓库:")
         repo_label.setFixedWidth(90)
-        repo_label.setStyleSheet("font-weight: 600;")
+        repo_label.setObjectName("fieldLabel")
         repo_row.addWidget(repo_label)
         
         self.repo_combo = QComboBox()
         self.repo_combo.setEnabled(False)
+        # 所有条目高度相同，弹出列表不必逐项测量
+        self.repo_combo.view().setUniformItemSizes(True)
         self.repo_combo.currentIndexChanged.connect(self._on_repo_selected)
         repo_row.addWidget(self.repo_combo)
         
@@ -617,11 +871,12 @@ class MainWindow(QMainWindow):
         
         branch_label = QLabel("选择分支:")
         branch_label.setFixedWidth(90)
-        branch_label.setStyleSheet("font-weight: 600;")
+        branch_label.setObjectName("fieldLabel")
         branch_row.addWidget(branch_label)
         
         self.branch_combo = QComboBox()
         self.branch_combo.setEnabled(False)
+        self.branch_combo.view().setUniformItemSizes(True)
         branch_row.addWidget(self.branch_combo)
         
         self.init_btn = StyledButton("初始化", "#4cc9f0")
@@ -646,7 +901,7 @@ class MainWindow(QMainWindow):
         
         interval_label = QLabel("上传间隔:")
         interval_label.setFixedWidth(90)
-        interval_label.setStyleSheet("font-weight: 600;")
+        interval_label.setObjectName("fieldLabel")
         interval_row.addWidget(interval_label)
         
         self.interval_spin = QSpinBox()
@@ -657,7 +912,7 @@ class MainWindow(QMainWindow):
         interval_row.addWidget(self.interval_spin)
         
         interval_hint = QLabel("建议: 6-12 小时")
-        interval_hint.setStyleSheet("color: #6c757d; font-size: 13px;")
+        interval_hint.setObjectName("hintLabel")
         interval_row.addWidget(interval_hint)
         interval_row.addStretch()
         
@@ -668,12 +923,10 @@ class MainWindow(QMainWindow):
         checkbox_row.setSpacing(40)
         
         self.auto_start_check = QCheckBox("开机自动启动（暂未启用）")
-        self.auto_start_check.setStyleSheet("QCheckBox { font-size: 14px; }")
         checkbox_row.addWidget(self.auto_start_check)
         
         self.minimize_tray_check = QCheckBox("最小化到系统托盘")
         self.minimize_tray_check.setChecked(True)
-        self.minimize_tray_check.setStyleSheet("QCheckBox { font-size: 14px; }")
         checkbox_row.addWidget(self.minimize_tray_check)
         checkbox_row.addStretch()
         
@@ -687,6 +940,14 @@ class MainWindow(QMainWindow):
         
         scroll_layout.addWidget(content_widget)
         
+        scroll.setWidget(scroll_content)
+        main_layout.addWidget(scroll)
+        self._scroll_layout = scroll_layout
+    
+    def _setup_ui_deferred(self):
+        """构建操作、日志区域和保存按钮，在窗口首次显示后调用"""
+        scroll_layout = self._scroll_layout
+        
         # 操作按钮区域
         action_card = self._create_card("🚀 操作控制")
         action_layout = QVBoxLayout()
@@ -698,7 +959,7 @@ class MainWindow(QMainWindow):
         
         task_label = QLabel("首次上传时间:")
         task_label.setFixedWidth(110)
-        task_label.setStyleSheet("font-weight: 600;")
+        task_label.setObjectName("fieldLabel")
         task_row.addWidget(task_label)
         
         self.first_upload_datetime = QDateTimeEdit()
@@ -738,15 +999,15 @@ class MainWindow(QMainWindow):
         status_row.setSpacing(32)
         
         self.status_label = QLabel("状态: 未开始")
-        self.status_label.setStyleSheet("font-size: 15px; color: #6c757d; font-weight: 500;")
+        self.status_label.setObjectName("statusLabel")
         status_row.addWidget(self.status_label)
         
         self.next_upload_label = QLabel("下次上传: --")
-        self.next_upload_label.setStyleSheet("font-size: 15px; color: #6c757d; font-weight: 500;")
+        self.next_upload_label.setObjectName("statusLabel")
         status_row.addWidget(self.next_upload_label)
         
         self.last_upload_label = QLabel("上次上传: --")
-        self.last_upload_label.setStyleSheet("font-size: 15px; color: #6c757d; font-weight: 500;")
+        self.last_upload_label.setObjectName("statusLabel")
         status_row.addWidget(self.last_upload_label)
         status_row.addStretch()
         
@@ -757,15 +1018,17 @@ class MainWindow(QMainWindow):
         stats_row.setSpacing(32)
         
         self.total_count_label = QLabel("累计上传: 0 次")
-        self.total_count_label.setStyleSheet("font-size: 15px; color: #6c757d; font-weight: 500;")
+        self.total_count_label.setObjectName("statusLabel")
         stats_row.addWidget(self.total_count_label)
         
         self.success_count_label = QLabel("成功: 0 次")
-        self.success_count_label.setStyleSheet("font-size: 15px; color: #28a745; font-weight: 500;")
+        self.success_count_label.setObjectName("statusLabel")
+        self.success_count_label.setProperty("state", "success")
         stats_row.addWidget(self.success_count_label)
         
         self.failed_count_label = QLabel("失败: 0 次")
-        self.failed_count_label.setStyleSheet("font-size: 15px; color: #dc3545; font-weight: 500;")
+        self.failed_count_label.setObjectName("statusLabel")
+        self.failed_count_label.setProperty("state", "error")
         stats_row.addWidget(self.failed_count_label)
         stats_row.addStretch()
         
@@ -780,6 +1043,8 @@ class MainWindow(QMainWindow):
         
         self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        # 只追加的日志不需要撤销记录
+        self.log_text.setUndoRedoEnabled(False)
         self.log_text.setMaximumBlockCount(1000)
         self.log_text.setMinimumHeight(200)
         log_layout.addWidget(self.log_text)
@@ -800,33 +1065,12 @@ class MainWindow(QMainWindow):
         # 保存配置按钮
         self.save_config_btn = StyledButton("💾 保存配置", "#4361ee")
         self.save_config_btn.setMinimumHeight(52)
-        self.save_config_btn.clicked.connect(self._save_config)
+        self.save_config_btn.clicked.connect(self._save_config_now)
         scroll_layout.addWidget(self.save_config_btn)
-        
-        scroll.setWidget(scroll_content)
-        main_layout.addWidget(scroll)
     
     def _create_card(self, title: str) -> QGroupBox:
         card = QGroupBox(title)
-        card.setStyleSheet("""
-            QGroupBox {
-                font-weight: 700;
-                border: none;
-                border-radius: 16px;
-                margin-top: 20px;
-                padding: 24px;
-                background-color: white;
-                color: #1a1a2e;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 24px;
-                padding: 0 16px;
-                color: #1a1a2e;
-                font-size: 16px;
-                font-weight: 700;
-            }
-        """)
+        card.setObjectName("card")
         return card
     
     def _setup_tray(self):
@@ -834,26 +1078,13 @@ class MainWindow(QMainWindow):
             return
         
         self.tray_icon = QSystemTrayIcon(self)
-        icon = self.style().standardIcon(QStyle.StandardPixmap.SP_ComputerIcon)
-        self.tray_icon.setIcon(icon)
+        if MainWindow._TRAY_ICON is None:
+            MainWindow._TRAY_ICON = self.style().standardIcon(QStyle.StandardPixmap.SP_ComputerIcon)
+        self.tray_icon.setIcon(MainWindow._TRAY_ICON)
         self.tray_icon.setToolTip("GitHub自动上传工具")
         
         tray_menu = QMenu()
-        tray_menu.setStyleSheet("""
-            QMenu {
-                background-color: white;
-                border: 1px solid #e0e0e0;
-                padding: 5px;
-            }
-            QMenu::item {
-                padding: 8px 25px;
-                border-radius: 4px;
-            }
-            QMenu::item:selected {
-                background-color: #2196F3;
-                color: white;
-            }
-        """)
+        tray_menu.setObjectName("trayMenu")
         
         show_action = QAction("显示主窗口", self)
         show_action.triggered.connect(self.showNormal)
@@ -882,20 +1113,61 @@ class MainWindow(QMainWindow):
             self.activateWindow()
     
     def _setup_auto_check(self):
-        self.status_timer = QTimer(self)
-        self.status_timer.timeout.connect(self._update_status)
-        self.status_timer.start(1000)
+        self._status_timer_active = True
+        self._refresh_status_interval()
+    
+    def _status_interval(self) -> int:
+        """返回状态刷新间隔，调度未运行时返回 0（没有需要刷新的倒计时）"""
+        if not self.scheduler.is_running():
+            return 0
+        if self.isHidden():
+            return self.STATUS_INTERVAL_HIDDEN
+        return self.STATUS_INTERVAL
+    
+    def _refresh_status_interval(self):
+        """窗口显示/隐藏或调度启停后调整状态刷新频率，调度未运行时停止刷新"""
+        if not self._status_timer_active:
+            return
+        interval = self._status_interval()
+        if interval == self._status_timer_interval:
+            return
+        if self._status_timer_id:
+            self.killTimer(self._status_timer_id)
+            self._status_timer_id = 0
+        self._status_timer_interval = interval
+        if not interval:
+            return
+        # 粗粒度定时器允许系统把唤醒与其他定时器合并
+        self._status_timer_id = self.startTimer(interval, Qt.TimerType.CoarseTimer)
+    
+    def timerEvent(self, event):
+        if event.timerId() == self._status_timer_id:
+            self._update_status()
+        else:
+            super().timerEvent(event)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._refresh_status_interval()
+        if self._status_timer_active:
+            # 从托盘恢复时立即刷新一次，不必等到下一个周期
+            self._update_status()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._refresh_status_interval()
     
     def _update_status(self):
-        if self.scheduler.is_running():
-            remaining = self.scheduler.get_remaining_time()
-            if remaining:
-                hours = int(remaining.total_seconds() // 3600)
-                minutes = int((remaining.total_seconds() % 3600) // 60)
-                self.next_upload_label.setText(f"下次上传: {hours}小时{minutes}分钟后")
+        if not self.scheduler.is_running():
+            return
         
-        if self.config_manager.config.last_upload_time:
-            self.last_upload_label.setText(f"上次上传: {self.config_manager.config.last_upload_time}")
+        remaining = self.scheduler.get_remaining_time()
+        if remaining:
+            countdown = divmod(int(remaining.total_seconds()) // 60, 60)
+            if countdown != self._last_countdown:
+                self._last_countdown = countdown
+                hours, minutes = countdown
+                _set_label_text(self.next_upload_label, f"下次上传: {hours}小时{minutes}分钟后")
     
     def _load_config(self):
         config = self.config_manager.config
@@ -904,76 +1176,73 @@ class MainWindow(QMainWindow):
         self.auto_start_check.setChecked(config.auto_start)
         self.minimize_tray_check.setChecked(config.minimize_to_tray)
         
-        if config.last_upload_time:
-            self.last_upload_label.setText(f"上次上传: {config.last_upload_time}")
-        
-        # 加载统计信息
-        self.total_count_label.setText(f"累计上传: {config.total_upload_count} 次")
-        self.success_count_label.setText(f"成功: {config.success_upload_count} 次")
-        self.failed_count_label.setText(f"失败: {config.failed_upload_count} 次")
+        # 加载上次上传时间与统计信息
+        self._update_stats_display()
         
         user_info = self.github_auth.get_user_info_dict()
         if user_info:
-            username = user_info.get('login', '')
-            self.auth_status_label.setText(f"状态: 已登录 ({username})")
-            self.auth_status_label.setStyleSheet("font-size: 14px; color: #4CAF50; font-weight: bold;")
-            self.auth_btn.setVisible(False)
-            self.logout_btn.setVisible(True)
-        
-        if config.target_folder and Path(config.target_folder).exists():
-            self._init_git_manager()
+            self._show_auth_state(user_info.get('login') or '')
+        
+        # 目标文件夹可能位于网络驱动器上，在后台检查是否存在，不阻塞首次绘制
+        if config.target_folder:
+            target_folder = config.target_folder
+            self._run_in_pool(
+                lambda progress: os.path.isdir(target_folder),
+                lambda exists: self._on_target_folder_checked(target_folder, exists),
+            )
         
         # 注意：自动启动功能已移除，现在需要用户手动点击"开始任务"按钮并设置首次上传时间
         # if config.auto_start and config.target_folder and config.repo_full_name:
         #     self._start_monitoring()
     
+    def _run_in_pool(self, fn: Callable[[Callable[[str], None]], Any],
+                     on_finished: Callable[[Any], None]) -> Task:
+        """在后台线程池中执行 fn，进度写入日志，完成后调用 on_finished"""
+        task = Task(fn)
+        task.signals.progress.connect(self._log)
+        task.signals.finished_signal.connect(on_finished)
+        self._bg_pool.start(task)
+        return task
+    
     def _start_auth(self):
-        # 清理旧的 Worker，避免重复连接
+        # 放弃旧的授权任务，它结束后的结果不再处理
         if self.auth_worker:
-            try:
-                self.auth_worker.progress.disconnect(self._log)
-                self.auth_worker.finished_signal.disconnect(self._on_auth_finished)
-            except Exception:
-                pass
-            if self.auth_worker.isRunning():
-                self.auth_worker.terminate()
-                self.auth_worker.wait(2000)
-            self.auth_worker.deleteLater()
+            self.auth_worker.release()
             self.auth_worker = None
 
         self.auth_btn.setEnabled(False)
         self._log("开始GitHub授权流程...")
         self._log("正在检查GitHub CLI登录状态...")
 
-        self.auth_worker = AuthWorker(self.github_auth)
-        self.auth_worker.progress.connect(self._log)
-        self.auth_worker.finished_signal.connect(self._on_auth_finished)
-        self.auth_worker.start()
+        def authenticate(progress: Callable[[str], None]) -> AuthResult:
+            results = []
+            # 启用自动web登录
+            self.github_auth.start_gh_cli_auth(results.append, progress, auto_web_login=True)
+            return results[-1] if results else AuthResult(success=False, error="授权未完成")
+
+        self.auth_worker = self._run_in_pool(authenticate, self._on_auth_finished)
     
     def _on_auth_finished(self, result):
-        from github_auth import AuthResult
         self.auth_btn.setEnabled(True)
 
-        # 清理 Worker 对象，避免内存泄漏
+        # 清理任务对象，避免内存泄漏
         if self.auth_worker:
-            self.auth_worker.finished_signal.disconnect(self._on_auth_finished)
-            self.auth_worker.progress.disconnect(self._log)
-            self.auth_worker.deleteLater()
+            self.auth_worker.release()
             self.auth_worker = None
 
-        if isinstance(result, AuthResult) and result.success:
-            username = result.credential.username if result.credential else ""
-            self.auth_status_label.setText(f"状态: 已登录 ({username})")
-            self.auth_status_label.setStyleSheet("font-size: 14px; color: #4CAF50; font-weight: bold;")
-            self.auth_btn.setVisible(False)
-            self.logout_btn.setVisible(True)
+        # 任务抛出的异常统一转换为失败结果，之后只需按 AuthResult 分支处理
+        if not isinstance(result, AuthResult):
+            result = AuthResult(success=False, error=f"授权过程出错: {str(result)}")
+
+        if result.success:
+            self._show_auth_state((result.credential.username if result.credential else None) or "")
             self._log("授权成功")
             self._load_repositories()
-        elif isinstance(result, AuthResult) and result.error == "NOT_LOGGED_IN":
+        elif result.error == "NOT_LOGGED_IN":
             self._log("GitHub CLI 未登录，需要用户手动登录")
             self._show_login_dialog()
         else:
-            error_msg = result.error if isinstance(result, AuthResult) else str(result)
+            error_msg = result.error or "未知错误"
             self._log(f"授权失败: {error_msg}")
 
             # 如果是登录超时或未完成，提供更友好的提示
@@ -1039,9 +1308,8 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, "错误", message)
         # 如果用户点击了"测试网络连接"
         elif msg_box.clickedButton() == test_network_btn:
+            # 测试完成后会再次显示对话框
             self._test_network_connection()
-            # 再次显示对话框
-            self._show_login_dialog()
         # 如果用户点击了"重新检测"
         elif msg_box.clickedButton() == retry_btn:
             self._start_auth()
@@ -1050,147 +1318,74 @@ class MainWindow(QMainWindow):
             self._show_login_help()
     
     def _test_network_connection(self):
-        """测试网络连接"""
+        """在后台测试网络连接，完成后显示结果并再次显示登录对话框"""
+        if self.network_test_worker:
+            return
         self._log("开始测试网络连接...")
         
-        import socket
-        try:
+        github_auth = self.github_auth
+
+        def test_network(progress: Callable[[str], None]) -> int:
             # 测试 DNS 解析
-            self._log("正在解析 github.com DNS...")
-            socket.gethostbyname('github.com')
-            self._log("✅ DNS 解析成功")
+            progress("正在解析 github.com DNS...")
+            # 测试网络时不使用旧的解析结果
+            dns_cache.clear()
+            # 经过 socket.getaddrinfo，解析结果进入 DNS 缓存，随后的 HTTPS 请求直接复用
+            socket.getaddrinfo('github.com', 443, type=socket.SOCK_STREAM)
+            progress("✅ DNS 解析成功")
             
             # 测试 HTTPS 连接
-            self._log("正在连接 GitHub...")
-            try:
-                from httpx import Client
-                client = Client(timeout=10)
-                response = client.get("https://github.com")
-                if response.status_code == 200:
-                    self._log("✅ GitHub 连接正常")
-                    QMessageBox.information(
-                        self, 
-                        "网络测试成功", 
-                        "网络连接正常！\n\n可以尝试重新登录。"
-                    )
-                else:
-                    self._log(f"❌ GitHub 返回状态码: {response.status_code}")
-                    QMessageBox.warning(
-                        self, 
-                        "网络测试警告", 
-                        f"可以连接到 GitHub，但返回状态码: {response.status_code}\n\n请稍后重试。"
-                    )
-                client.close()
-            except Exception as e:
-                self._log(f"❌ 连接 GitHub 失败: {e}")
-                QMessageBox.warning(
-                    self, 
-                    "网络连接失败", 
-                    f"无法连接到 GitHub！\n\n错误: {str(e)}\n\n请查看帮助了解更多信息。"
-                )
-        except socket.gaierror as e:
-            self._log(f"❌ DNS 解析失败: {e}")
+            progress("正在连接 GitHub...")
+            return github_auth.probe_github()
+
+        self.network_test_worker = self._run_in_pool(test_network, self._on_network_test_finished)
+    
+    def _on_network_test_finished(self, result):
+        if self.network_test_worker:
+            self.network_test_worker.release()
+            self.network_test_worker = None
+
+        if isinstance(result, socket.gaierror):
+            self._log(f"❌ DNS 解析失败: {result}")
             QMessageBox.critical(
                 self, 
                 "DNS 解析失败", 
-                f"无法解析 github.com！\n\n错误: {str(e)}\n\n请检查：\n1. 网络连接\n2. DNS 设置\n3. 代理配置"
+                f"无法解析 github.com！\n\n错误: {str(result)}\n\n请检查：\n1. 网络连接\n2. DNS 设置\n3. 代理配置"
             )
-        except Exception as e:
-            self._log(f"❌ 网络测试失败: {e}")
-            QMessageBox.critical(
+        elif isinstance(result, Exception):
+            self._log(f"❌ 连接 GitHub 失败: {result}")
+            QMessageBox.warning(
+                self, 
+                "网络连接失败", 
+                f"无法连接到 GitHub！\n\n错误: {str(result)}\n\n请查看帮助了解更多信息。"
+            )
+        elif result == 200:
+            self._log("✅ GitHub 连接正常")
+            QMessageBox.information(
                 self, 
-                "网络测试失败", 
-                f"网络测试失败！\n\n错误: {str(e)}"
+                "网络测试成功", 
+                "网络连接正常！\n\n可以尝试重新登录。"
             )
+        else:
+            self._log(f"❌ GitHub 返回状态码: {result}")
+            QMessageBox.warning(
+                self, 
+                "网络测试警告", 
+                f"可以连接到 GitHub，但返回状态码: {result}\n\n请稍后重试。"
+            )
+        
+        # 再次显示登录对话框
+        self._show_login_dialog()
     
     def _show_login_help(self):
         """显示登录帮助信息"""
-        help_text = """GitHub CLI 登录帮助
-
-【推荐方式】浏览器登录（自动）
-1. 点击"打开浏览器登录"按钮
-2. 浏览器会自动打开 GitHub 授权页面
-3. 在浏览器中登录你的 GitHub 账号
-4. 授权成功后，程序会自动获取登录状态
-
-【备用方式】终端登录
-1. 点击"打开终端登录"按钮
-2. 在终端中执行：gh auth login
-3. 按照提示选择：
-   - What account do you want to log into? -> GitHub.com
-   - What is your preferred protocol? -> HTTPS
-   - Authenticate Git with your GitHub credentials? -> Yes
-   - How would you like to authenticate? -> Login with a web browser
-
-【常见问题排查】
-
-⚠️ 错误：error connecting to github.com
-
-这个错误表示无法连接到 GitHub，请按以下步骤排查：
-
-1. 网络连接检查
-   - 在浏览器中打开 https://github.com 测试
-   - 确认可以正常访问
-
-2. 代理配置（如果需要）
-   如果您使用代理，请配置环境变量：
-   
-   在 PowerShell 中：
-   $env:HTTP_PROXY="http://proxy.example.com:port"
-   $env:HTTPS_PROXY="http://proxy.example.com:port"
-   
-   在 CMD 中：
-   set HTTP_PROXY=http://proxy.example.com:port
-   set HTTPS_PROXY=http://proxy.example.com:port
-   
-   或者为 Git 配置代理：
-   git config --global http.proxy http://proxy.example.com:port
-   git config --global https.proxy http://proxy.example.com:port
-
-3. 检查防火墙/安全软件
-   - 确保防火墙允许访问 GitHub
-   - 检查杀毒软件是否阻止连接
-   - 尝试临时关闭安全软件测试
-
-4. DNS 解析问题
-   - 尝试使用公共 DNS 服务器：
-     * 8.8.8.8 (Google DNS)
-     * 1.1.1.1 (Cloudflare DNS)
-   - 修改网络适配器的 DNS 设置
-
-5. 检查 VPN/代理软件
-   - 关闭所有 VPN 软件
-   - 关闭其他代理工具（如 Clash、V2Ray 等）
-   - 如果必须使用代理，请确保配置正确
-
-6. GitHub 服务状态
-   - 访问 https://githubstatus.com
-   - 确认 GitHub 服务是否正常运行
-
-7. 其他问题
-   - 确认系统时间是否正确
-   - 尝试重启计算机
-   - 检查是否有其他程序占用端口
-
-【手动验证连接】
-在终端中执行以下命令测试：
-ping github.com
-curl -I https://github.com
-
-【快速解决方案】
-如果以上方法都无法解决，可以尝试：
-1. 使用手机热点连接网络
-2. 更换网络环境
-3. 联系网络管理员"""
-        
-        QMessageBox.information(self, "登录帮助", help_text)
+        QMessageBox.information(self, "登录帮助", _LOGIN_HELP_TEXT)
     
     def _logout(self):
         if self.github_auth.logout():
-            self.auth_status_label.setText("状态: 未登录")
-            self.auth_status_label.setStyleSheet("font-size: 14px; color: #666;")
-            self.auth_btn.setVisible(True)
-            self.logout_btn.setVisible(False)
+            self._show_auth_state(None)
+            self._repos = []
+            self._repos_by_name = {}
             self.repo_combo.clear()
             self.repo_combo.setEnabled(False)
             self.branch_combo.clear()
@@ -1205,62 +1400,110 @@ curl -I https://github.com
             return
 
         # 防止重复加载
-        if hasattr(self, '_loading_repos') and self._loading_repos:
+        if self.repos_worker:
             self._log("正在加载仓库列表，请稍候...")
             return
 
-        self._loading_repos = True
-
         self._log("正在获取仓库列表...")
-        print("开始获取仓库列表...")
+        logger.debug("开始获取仓库列表...")
 
-        try:
-            self._repos = self.github_auth.get_repositories()
-            print(f"获取到 {len(self._repos)} 个仓库")
+        # 后台一次请求取回仓库及其分支，界面不阻塞
+        github_auth = self.github_auth
+        self.repos_worker = self._run_in_pool(
+            lambda progress: github_auth.get_repositories_with_branches(),
+            self._on_repos_loaded,
+        )
+    
+    def _on_repos_loaded(self, result):
+        if self.repos_worker:
+            self.repos_worker.release()
+            self.repos_worker = None
 
-            self.repo_combo.clear()
-            self.repo_combo.addItem("请选择仓库...", "")
+        if isinstance(result, Exception):
+            self._log(f"加载仓库列表失败: {str(result)}")
+            return
 
+        try:
+            self._repos = result
+            self._repos_by_name = {repo['full_name']: repo for repo in result}
+            logger.debug("获取到 %s 个仓库", len(self._repos))
+
+            # 先在控件外构建完整的模型，再一次性设置给下拉框
+            model = QStandardItemModel(self.repo_combo)
+            placeholder = QStandardItem("请选择仓库...")
+            placeholder.setData("", Qt.ItemDataRole.UserRole)
+            items = [placeholder]
             for repo in self._repos:
                 # 使用 [P] 替代 emoji 避免Windows上的字体渲染问题导致的崩溃
                 display_text = f"[P] {repo['full_name']}" if repo['private'] else repo['full_name']
-                self.repo_combo.addItem(display_text, repo['full_name'])
+                item = QStandardItem(display_text)
+                item.setData(repo['full_name'], Qt.ItemDataRole.UserRole)
+                items.append(item)
+            model.invisibleRootItem().appendRows(items)
+
+            # 替换模型会先把当前项重置为占位项，屏蔽信号直到恢复上次的选择，
+            # 之后只处理一次选择变化
+            self.repo_combo.blockSignals(True)
+            try:
+                # 旧模型的父对象是下拉框，setModel 时会被 Qt 自动删除
+                self.repo_combo.setModel(model)
+                config = self.config_manager.config
+                if config.repo_full_name:
+                    index = self.repo_combo.findData(config.repo_full_name)
+                    if index >= 0:
+                        self.repo_combo.setCurrentIndex(index)
+            finally:
+                self.repo_combo.blockSignals(False)
 
             self.repo_combo.setEnabled(True)
             self.refresh_repos_btn.setEnabled(True)
             self._log(f"已加载 {len(self._repos)} 个仓库")
+            self._on_repo_selected(self.repo_combo.currentIndex())
 
-            config = self.config_manager.config
-            if config.repo_full_name:
-                index = self.repo_combo.findData(config.repo_full_name)
-                if index >= 0:
-                    self.repo_combo.setCurrentIndex(index)
+            # REST 返回的仓库不含分支，后台预取最近更新的几个仓库（含当前选中的），
+            # 之后选择这些仓库时无需等待网络
+            if self._repos and 'branches' not in self._repos[0]:
+                prefetch = self._repos[:self.BRANCH_PREFETCH_COUNT]
+                selected = self._repos_by_name.get(self.repo_combo.currentData() or "")
+                if selected is not None and selected not in prefetch:
+                    prefetch.append(selected)
+                self._fetch_branches(prefetch)
         except Exception as e:
             self._log(f"加载仓库列表失败: {str(e)}")
-        finally:
-            self._loading_repos = False
     
     def _on_repo_selected(self, index):
         if index <= 0:
+            self._branches_pending = None
             self.branch_combo.clear()
             self.branch_combo.setEnabled(False)
             self.init_btn.setEnabled(False)
             return
         
         repo_full_name = self.repo_combo.currentData()
-        repo_info = next((r for r in self._repos if r['full_name'] == repo_full_name), None)
+        repo_info = self._repos_by_name.get(repo_full_name)
         
         if not repo_info:
             return
         
-        self._log(f"正在获取分支列表: {repo_full_name}")
-        
-        owner, repo_name = repo_full_name.split('/')
-        branches = self.github_auth.get_branches(owner, repo_name)
+        # GraphQL 已随仓库列表一并返回分支，预取过的仓库也已带有分支
+        branches = repo_info.get('branches')
+        if branches is not None:
+            self._branches_pending = None
+            self._show_branches(repo_info, branches)
+            return
         
+        # 退回 REST 时在后台获取，完成后由 _on_branches_loaded 填充
+        self._log(f"正在获取分支列表: {repo_full_name}")
+        self._branches_pending = repo_full_name
         self.branch_combo.clear()
-        for branch in branches:
-            self.branch_combo.addItem(branch)
+        self.branch_combo.setEnabled(False)
+        self.init_btn.setEnabled(False)
+        self._fetch_branches([repo_info])
+    
+    def _show_branches(self, repo_info: dict, branches: List[str]):
+        """填充分支下拉框并选中默认分支"""
+        self.branch_combo.clear()
+        self.branch_combo.addItems(branches)
         
         default_branch = repo_info.get('default_branch', 'main')
         default_index = self.branch_combo.findText(default_branch)
@@ -1272,13 +1515,64 @@ curl -I https://github.com
         
         self._save_config()
     
+    def _fetch_branches(self, repos: List[dict]):
+        """在后台并发获取多个仓库的分支，结果写入各仓库信息的 branches"""
+        # 新请求取代尚未完成的旧请求
+        if self.branches_worker:
+            self.branches_worker.release()
+        
+        github_auth = self.github_auth
+        keys = [tuple(repo['full_name'].split('/', 1)) for repo in repos]
+        self.branches_worker = self._run_in_pool(
+            lambda progress: github_auth.get_branches_many(keys),
+            self._on_branches_loaded,
+        )
+    
+    def _on_branches_loaded(self, result):
+        if self.branches_worker:
+            self.branches_worker.release()
+            self.branches_worker = None
+        
+        if isinstance(result, Exception):
+            self._log(f"获取分支列表失败: {str(result)}")
+            result = {}
+        
+        for (owner, repo_name), branches in result.items():
+            repo_info = self._repos_by_name.get(f"{owner}/{repo_name}")
+            # 空列表表示获取失败，不写入，下次选中时重新获取
+            if repo_info is not None and branches:
+                repo_info['branches'] = branches
+        
+        # 当前选中的仓库正在等待分支时填充下拉框
+        pending = self._branches_pending
+        if pending and pending == self.repo_combo.currentData():
+            self._branches_pending = None
+            repo_info = self._repos_by_name.get(pending)
+            if repo_info is not None:
+                self._show_branches(repo_info, repo_info.get('branches', []))
+    
     def _save_config(self):
+        """界面变化后保存配置：CONFIG_SAVE_DELAY 毫秒内的多次调用合并为一次，不弹出提示"""
+        self._save_timer.start(self.CONFIG_SAVE_DELAY)
+    
+    def _save_config_now(self):
+        """点击"保存配置"：立即保存并弹出提示"""
+        self._save_timer.stop()
+        self._do_save_config(show_dialog=True)
+    
+    def _flush_pending_config(self):
+        """有尚未执行的延迟保存时立即执行，保证随后读取的配置是最新的"""
+        if self._save_timer.isActive():
+            self._save_timer.stop()
+            self._do_save_config()
+    
+    def _do_save_config(self, show_dialog: bool = False):
         repo_full_name = self.repo_combo.currentData() if self.repo_combo.currentIndex() > 0 else ""
         branch = self.branch_combo.currentText() if self.branch_combo.count() > 0 else "main"
         
         repo_url = ""
         if repo_full_name:
-            repo_info = next((r for r in self._repos if r['full_name'] == repo_full_name), None)
+            repo_info = self._repos_by_name.get(repo_full_name)
             if repo_info:
                 repo_url = repo_info.get('clone_url', '')
         
@@ -1286,7 +1580,7 @@ curl -I https://github.com
         git_username = user_info.get('login', '') if user_info else ''
         git_email = user_info.get('email', '') if user_info else ''
         
-        success = self.config_manager.update(
+        self.config_manager.update(
             target_folder=self.folder_input.text(),
             repo_full_name=repo_full_name,
             repo_url=repo_url,
@@ -1298,11 +1592,15 @@ curl -I https://github.com
             minimize_to_tray=self.minimize_tray_check.isChecked()
         )
         
-        if success:
+        # 自动保存只标记修改，由 ConfigManager 延迟写盘；手动保存立即写盘并报告结果
+        if not show_dialog:
+            return
+        if self.config_manager.flush():
             self._log("配置已保存")
             QMessageBox.information(self, "成功", "配置已保存")
-        
-        return success
+        else:
+            self._log("配置保存失败")
+            QMessageBox.warning(self, "失败", "配置保存失败，请检查程序目录是否可写")
     
     def _browse_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "选择目标文件夹")
@@ -1310,6 +1608,11 @@ curl -I https://github.com
             self.folder_input.setText(folder)
             self._save_config()
     
+    def _on_target_folder_checked(self, target_folder: str, exists):
+        # 检查期间用户可能已经选择了其他文件夹
+        if exists is True and target_folder == self.folder_input.text():
+            self._init_git_manager()
+    
     def _init_git_manager(self):
         target_folder = self.folder_input.text()
         if not target_folder:
@@ -1318,7 +1621,7 @@ curl -I https://github.com
         repo_url = ""
         repo_full_name = self.repo_combo.currentData() if self.repo_combo.count() > 0 else ""
         if repo_full_name:
-            repo_info = next((r for r in self._repos if r['full_name'] == repo_full_name), None)
+            repo_info = self._repos_by_name.get(repo_full_name)
             if repo_info:
                 repo_url = repo_info.get('clone_url', '')
         
@@ -1354,24 +1657,21 @@ curl -I https://github.com
         self.init_btn.setEnabled(False)
         self._log("开始初始化仓库...")
         
-        self.init_worker = InitWorker(
-            self.git_manager,
-            username,
-            email,
-            token
-        )
-        self.init_worker.progress.connect(self._log)
-        self.init_worker.finished_signal.connect(self._on_init_finished)
-        self.init_worker.start()
+        git_manager = self.git_manager
+
+        def init_repository(progress: Callable[[str], None]):
+            git_manager.set_progress_callback(progress)
+            return git_manager.init_repository(username, email, token)
+
+        self.init_worker = self._run_in_pool(init_repository, self._on_init_finished)
     
-    def _on_init_finished(self, success: bool, message: str):
+    def _on_init_finished(self, result):
         self.init_btn.setEnabled(True)
+        success, message = _task_result(result)[:2]
 
-        # 清理 Worker 对象，避免内存泄漏
+        # 清理任务对象，避免内存泄漏
         if self.init_worker:
-            self.init_worker.finished_signal.disconnect(self._on_init_finished)
-            self.init_worker.progress.disconnect(self._log)
-            self.init_worker.deleteLater()
+            self.init_worker.release()
             self.init_worker = None
 
         if success:
@@ -1394,13 +1694,15 @@ curl -I https://github.com
             return
         
         self._log("手动触发上传")
-        self._perform_upload()
+        self._perform_upload(force=True)
     
-    def _perform_upload(self):
-        if self.upload_worker and self.upload_worker.isRunning():
+    def _perform_upload(self, force: bool = False):
+        if self.upload_worker:
             self._log("上传任务正在进行中...")
             return
         
+        # 刚修改的目标文件夹可能还在等待保存
+        self._flush_pending_config()
         target_files = self.config_manager.get_target_files()
         if not target_files:
             self._log("没有找到需要上传的文件")
@@ -1410,32 +1712,33 @@ curl -I https://github.com
         username = user_info.get('login', '') if user_info else ''
         token = self.github_auth.get_token() or ''
         
-        self.upload_worker = UploadWorker(
-            self.git_manager,
-            target_files,
-            self.config_manager.config.file_hashes,
-            username,
-            token
-        )
-        self.upload_worker.progress.connect(self._log)
-        self.upload_worker.finished_signal.connect(self._on_upload_finished)
-        self.upload_worker.start()
+        git_manager = self.git_manager
+        stored_hashes = self.config_manager.config.file_hashes
+
+        def upload(progress: Callable[[str], None]):
+            git_manager.set_progress_callback(progress)
+            return git_manager.sync_and_upload(
+                target_files, stored_hashes, username, token, force=force
+            )
+
+        self.upload_worker = self._run_in_pool(upload, self._on_upload_finished)
     
-    def _on_upload_finished(self, success: bool, message: str):
+    def _on_upload_finished(self, result):
+        success, message, new_hashes = _task_result(result)
 
-        # 清理 Worker 对象，避免内存泄漏
+        # 清理任务对象，避免内存泄漏
         if self.upload_worker:
-            # 先获取 new_hashes（如果存在）
-            new_hashes = None
-            if hasattr(self.upload_worker, 'new_hashes'):
-                new_hashes = self.upload_worker.new_hashes
-
-            # 断开信号连接
-            self.upload_worker.finished_signal.disconnect(self._on_upload_finished)
-            self.upload_worker.progress.disconnect(self._log)
-            self.upload_worker.deleteLater()
+            self.upload_worker.release()
             self.upload_worker = None
 
+            # 文件没有变化时没有真正上传：只保存文件元数据，不更新上传时间和次数，也不弹出托盘通知
+            if success and message == NO_CHANGES_MESSAGE:
+                # 内容未变但修改时间可能已变，保存新的元数据，下次检查无需重新计算哈希
+                if new_hashes:
+                    self.config_manager.set_file_hashes(new_hashes)
+                self._log("无变更，跳过上传")
+                return
+
             config = self.config_manager.config
             config.total_upload_count += 1
 
@@ -1446,8 +1749,7 @@ curl -I https://github.com
 
                 # 使用保存的 new_hashes
                 if new_hashes:
-                    for filename, file_hash in new_hashes.items():
-                        self.config_manager.set_file_hash(filename, file_hash)
+                    self.config_manager.set_file_hashes(new_hashes)
 
                 # 调度器会自动在下一次上传完成后设置下次上传时间
                 if self.scheduler.is_running():
@@ -1498,9 +1800,29 @@ curl -I https://github.com
     
     def _update_stats_display(self):
         config = self.config_manager.config
-        self.total_count_label.setText(f"累计上传: {config.total_upload_count} 次")
-        self.success_count_label.setText(f"成功: {config.success_upload_count} 次")
-        self.failed_count_label.setText(f"失败: {config.failed_upload_count} 次")
+        stats = (config.total_upload_count, config.success_upload_count,
+                 config.failed_upload_count, config.last_upload_time)
+        if stats == self._last_stats:
+            return
+        self._last_stats = stats
+        with _updates_suspended(self.total_count_label.parentWidget()):
+            _set_label_text(self.total_count_label, f"累计上传: {config.total_upload_count} 次")
+            _set_label_text(self.success_count_label, f"成功: {config.success_upload_count} 次")
+            _set_label_text(self.failed_count_label, f"失败: {config.failed_upload_count} 次")
+            if config.last_upload_time:
+                _set_label_text(self.last_upload_label, f"上次上传: {config.last_upload_time}")
+    
+    def _show_auth_state(self, username: Optional[str]):
+        """更新登录状态标签与登录/退出按钮，username 为 None 表示未登录"""
+        with _updates_suspended(self.auth_btn.parentWidget()):
+            if username is None:
+                self.auth_status_label.setText("状态: 未登录")
+                _set_label_state(self.auth_status_label, "idle")
+            else:
+                self.auth_status_label.setText(f"状态: 已登录 ({username})")
+                _set_label_state(self.auth_status_label, "active")
+            self.auth_btn.setVisible(username is None)
+            self.logout_btn.setVisible(username is not None)
     
     def _set_current_time_plus_10s(self):
         """设置首次上传时间为当前时间+10秒，方便开发者快速测试"""
@@ -1518,21 +1840,22 @@ curl -I https://github.com
             QMessageBox.warning(self, "错误", "请先初始化仓库")
             return
         
-        target_time = self.first_upload_datetime.dateTime().toPyDateTime()
-        current_time = QDateTime.currentDateTime().toPyDateTime()
+        # 直接在 QDateTime 上计算间隔，只在格式化时转换一次
+        target_qt = self.first_upload_datetime.dateTime()
+        delay_ms = QDateTime.currentDateTime().msecsTo(target_qt)
         
-        if target_time <= current_time:
+        if delay_ms <= 0:
             QMessageBox.warning(self, "错误", "首次上传时间必须大于当前时间")
             return
         
-        time_diff = (target_time - current_time).total_seconds()
+        target_text = target_qt.toPyDateTime().strftime("%Y年%m月%d日 %H:%M:%S")
         config = self.config_manager.config
         
         if not config.first_upload_time:
-            config.first_upload_time = target_time.strftime("%Y年%m月%d日 %H:%M:%S")
+            config.first_upload_time = target_text
             self.config_manager.save()
         
-        self._log(f"任务已安排，将在 {target_time.strftime('%Y年%m月%d日 %H:%M:%S')} 开始首次上传")
+        self._log(f"任务已安排，将在 {target_text} 开始首次上传")
         self._log(f"首次上传后，将每隔 {self.interval_spin.value()} 小时自动上传一次")
         self._log("已启动文件监控，检测到文件变化将触发上传")
         
@@ -1541,25 +1864,27 @@ curl -I https://github.com
         self.file_watcher.start(
             target_path,
             config.files_to_upload,
-            self._on_file_changed
+            self.file_changed.emit
         )
         
         # 使用 QTimer 触发首次上传（不在调度器中执行首次上传）
-        QTimer.singleShot(int(time_diff * 1000), self._perform_first_upload)
+        # 间隔可能长达数小时，使用精确定时器，避免 CoarseTimer 5% 的误差
+        QTimer.singleShot(delay_ms, Qt.TimerType.PreciseTimer, self._perform_first_upload)
         
         # 更新UI状态
         self.start_task_btn.setEnabled(False)
         self.start_task_btn.setText("📅 任务运行中")
         self.stop_task_btn.setEnabled(True)
-        self.status_label.setText("状态: 运行中")
-        self.status_label.setStyleSheet("font-size: 14px; color: #4CAF50; font-weight: bold;")
+        _set_label_text(self.status_label, "状态: 运行中")
+        _set_label_state(self.status_label, "active")
         
         self._save_config()
     
     def _perform_first_upload(self):
         """执行首次上传"""
         self._log("开始执行首次上传...")
-        self._perform_upload()
+        # 与"立即上传"相同，用户安排的首次上传即使没有变更也执行
+        self._perform_upload(force=True)
         
         # 首次上传完成后，启动周期性调度器
         self._log("首次上传完成，启动周期性调度...")
@@ -1568,6 +1893,7 @@ curl -I https://github.com
             self._scheduled_upload
         )
         self._log(f"已启动周期性调度，每隔 {self.interval_spin.value()} 小时自动上传")
+        self._refresh_status_interval()
     
     def _stop_task(self):
         """停止整个任务（文件监控 + 调度器）"""
@@ -1577,9 +1903,11 @@ curl -I https://github.com
         self.start_task_btn.setEnabled(True)
         self.start_task_btn.setText("📅 开始任务")
         self.stop_task_btn.setEnabled(False)
-        self.status_label.setText("状态: 已停止")
-        self.status_label.setStyleSheet("font-size: 14px; color: #666;")
+        _set_label_text(self.status_label, "状态: 已停止")
+        _set_label_state(self.status_label, "idle")
         self.next_upload_label.setText("下次上传: --")
+        self._last_countdown = None
+        self._refresh_status_interval()
         self._log("任务已停止")
     
     def _reset_task_button(self):
@@ -1588,15 +1916,26 @@ curl -I https://github.com
         self.start_task_btn.setText("📅 开始任务")
     
     def _clear_log(self):
+        self._log_buffer.clear()
         self.log_text.clear()
     
     def _log(self, message: str):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.appendPlainText(f"[{timestamp}] {message}")
+        second = int(time.time())
+        if second != self._log_timestamp[0]:
+            self._log_timestamp = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+        self._log_buffer.append(f"[{self._log_timestamp[1]}] {message}")
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start(self.LOG_FLUSH_INTERVAL)
+    
+    def _flush_log(self):
+        if self._log_buffer:
+            self.log_text.appendPlainText("\n".join(self._log_buffer))
+            self._log_buffer.clear()
     
     def closeEvent(self, event):
         if self.minimize_tray_check.isChecked() and self.tray_icon:
             event.ignore()
+            self._flush_geometry(force=True)
             self.hide()
             self.tray_icon.showMessage(
                 "GitHub自动上传工具",
@@ -1608,7 +1947,15 @@ curl -I https://github.com
             self._quit_application()
     
     def _quit_application(self):
+        # 停止文件监控和调度器（状态刷新随调度一起停止）
         self._stop_task()
         if self.tray_icon:
             self.tray_icon.hide()
+        self._flush_pending_config()
+        self._flush_geometry(force=True)
+        # 丢弃尚未开始的后台任务，再等待正在执行的任务结束（无法强制终止），最多 2 秒；
+        # 任务可能仍在使用共享的 HTTP 客户端，超时未结束时不关闭，留给 atexit 处理
+        self._bg_pool.clear()
+        if self._bg_pool.waitForDone(2000):
+            self.github_auth.close()
         QApplication.quit()
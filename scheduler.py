@@ -1,15 +1,20 @@
-import time
-import threading
 from typing import Callable, Optional
 from datetime import datetime, timedelta
 
+from PyQt6.QtCore import Qt, QTimer
+
 
 class UploadScheduler:
+    """
+    定时上传调度器
+    使用 Qt 主线程上的单次 QTimer，回调直接在界面线程执行，不需要额外线程
+    """
+    
     def __init__(self):
         self._interval_hours: int = 6
         self._callback: Optional[Callable[[], None]] = None
-        self._thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
+        # 首次 start 时创建（需要 QApplication 已存在）
+        self._timer: Optional[QTimer] = None
         self._running = False
         self._next_run_time: Optional[datetime] = None
         self._last_run_time: Optional[datetime] = None
@@ -24,41 +29,46 @@ class UploadScheduler:
         if self._running:
             self.stop()
         
+        if self._timer is None:
+            self._timer = QTimer()
+            self._timer.setSingleShot(True)
+            # 默认的 CoarseTimer 允许 5% 误差，间隔为数小时时可能偏差数十分钟
+            self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+            self._timer.timeout.connect(self._fire)
+        
         self._interval_hours = interval_hours
         self._callback = callback
-        self._stop_event.clear()
         self._running = True
         
         # 立即设置下次上传时间（间隔时间后）
-        self._next_run_time = datetime.now() + timedelta(hours=interval_hours)
-        
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        self._schedule_next(datetime.now())
         return True
     
     def stop(self):
-        self._stop_event.set()
         self._running = False
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=5)
-        self._thread = None
+        if self._timer:
+            self._timer.stop()
         self._next_run_time = None
     
-    def _run_loop(self):
-        while not self._stop_event.is_set():
-            try:
-                if self._next_run_time and datetime.now() >= self._next_run_time:
-                    # 到达上传时间，执行上传
-                    if self._callback:
-                        self._callback()
-                    self._last_run_time = datetime.now()
-                    # 上传执行后，立即设置下次上传时间（间隔时间后）
-                    # 这样可以实现：上传完成后 -> 倒计时 -> 再次上传
-                    self._next_run_time = datetime.now() + timedelta(hours=self._interval_hours)
-                
-                time.sleep(30)
-            except Exception:
-                time.sleep(60)
+    def _schedule_next(self, now: datetime):
+        """从 now 起间隔 _interval_hours 小时后触发"""
+        self._next_run_time = now + timedelta(hours=self._interval_hours)
+        self._timer.start(self._interval_hours * 3_600_000)
+    
+    def _fire(self):
+        # 到达上传时间，执行上传
+        try:
+            if self._callback:
+                self._callback()
+        except Exception as e:
+            print(f"定时上传回调出错: {e}")
+        now = datetime.now()
+        self._last_run_time = now
+        # 回调中可能已调用 stop()
+        if self._running:
+            # 上传执行后，立即设置下次上传时间（间隔时间后）
+            # 这样可以实现：上传完成后 -> 倒计时 -> 再次上传
+            self._schedule_next(now)
     
     def is_running(self) -> bool:
         return self._running
@@ -79,4 +89,4 @@ class UploadScheduler:
         self._interval_hours = interval_hours
         # 更新间隔时，如果有下次运行时间，重新计算
         if self._running and self._next_run_time:
-            self._next_run_time = datetime.now() + timedelta(hours=interval_hours)
+            self._schedule_next(datetime.now())